@@ -0,0 +1,116 @@
+"""
+Atomic no-clobber renames for the Batch File Renamer app.
+On Linux, renameat2() refuses to overwrite an existing target
+(RENAME_NOREPLACE) and can swap two names in one step (RENAME_EXCHANGE), so
+each file needs a single syscall and no other process can slip a file in
+between an existence check and the rename. Elsewhere, and on filesystems that
+do not support the flags, it falls back to checking first and then renaming.
+"""
+
+import ctypes
+import errno
+import os
+import sys
+
+from rename_engine import LocalFileSystem
+
+
+RENAME_NOREPLACE = 1
+RENAME_EXCHANGE = 2
+
+# renameat2 flags are rejected with one of these on filesystems (NFS, SMB, ...)
+# or kernels that do not support them
+_UNSUPPORTED_ERRNOS = {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP}
+
+AT_FDCWD = -100
+
+
+def _load_renameat2():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        function = libc.renameat2  # glibc 2.28+
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p,
+                         ctypes.c_uint]
+    function.restype = ctypes.c_int
+    return function
+
+
+_renameat2 = _load_renameat2()
+HAVE_RENAMEAT2 = _renameat2 is not None
+
+# Folders whose filesystem rejected RENAME_NOREPLACE; they use the fallback directly
+_fallback_dirs = set()
+
+
+def renameat2(source, target, flags):
+    """Call renameat2(2) with paths relative to the working directory.
+
+    Raises OSError on failure, with errno ENOSYS if renameat2 is unavailable.
+    """
+    if _renameat2 is None:
+        raise OSError(errno.ENOSYS, "renameat2 is not available", os.fspath(source))
+    if _renameat2(AT_FDCWD, os.fsencode(source), AT_FDCWD, os.fsencode(target), flags) != 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code), os.fspath(source), None, os.fspath(target))
+
+
+def rename_noreplace(source, target):
+    """Rename source to target, raising FileExistsError instead of overwriting."""
+    if _renameat2 is not None and not (_fallback_dirs and _directory(target) in _fallback_dirs):
+        if _renameat2(AT_FDCWD, os.fsencode(source), AT_FDCWD, os.fsencode(target),
+                      RENAME_NOREPLACE) == 0:
+            return
+        code = ctypes.get_errno()
+        if code not in _UNSUPPORTED_ERRNOS:
+            raise OSError(code, os.strerror(code), os.fspath(source), None, os.fspath(target))
+        _fallback_dirs.add(_directory(target))
+
+    # Not atomic: another process could still create target in between
+    if os.path.lexists(target):
+        raise FileExistsError(errno.EEXIST, "File exists", os.fspath(target))
+    os.rename(source, target)
+
+
+def _directory(path):
+    return os.path.dirname(os.path.abspath(path))
+
+
+def exchange(first, second):
+    """Atomically swap the names of two existing files."""
+    try:
+        renameat2(first, second, RENAME_EXCHANGE)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            raise OSError(e.errno, "Swapping names is not supported on this filesystem",
+                          os.fspath(first))
+        raise
+
+
+class AtomicFileSystem(LocalFileSystem):
+    """Filesystem backend that renames with renameat2 (Linux only).
+
+    rename() never overwrites, so apply_plan skips its separate exists()
+    check, and exchange() lets plans that swap two names run without a
+    temporary name.
+    """
+
+    no_clobber = True
+
+    def rename(self, source, target):
+        """Rename source to target; raises FileExistsError if target exists."""
+        rename_noreplace(source, target)
+
+    def exchange(self, first, second):
+        """Swap the names of two files in one step."""
+        exchange(first, second)
+
+
+def create_local_filesystem():
+    """Return the best backend for renaming in place on this platform."""
+    if HAVE_RENAMEAT2:
+        return AtomicFileSystem()
+    return LocalFileSystem()
@@ -0,0 +1,83 @@
+"""
+Benchmark harness for Batch File Renamer name generator plugins.
+Runs each plugin over large synthetic batches (no disk access) and reports
+how many names per second it produces.
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from name_plugins import NameBatch, discover_plugins, load_plugin, run_plugin, PluginError
+
+
+EXTENSIONS = ['.jpg', '.png', '.txt', '.pdf', '.mp4', '.docx']
+
+
+def synthetic_batch(count, seed=0):
+    """Create a NameBatch of fake files with fake size/date columns."""
+    rng = random.Random(seed)
+    folder = os.path.join(os.sep, "benchmark")
+    paths = [os.path.join(folder, f"file_{rng.randrange(10**8):08d}{rng.choice(EXTENSIONS)}")
+             for _ in range(count)]
+    now = time.time()
+    stats = [os.stat_result((0o100644, i, 1, 1, 0, 0, rng.randrange(1, 10**8),
+                             now, now - rng.randrange(10**8), now))
+             for i in range(count)]
+    return NameBatch(paths, range(count), start_number=1, stats=stats)
+
+
+def benchmark_plugin(info, sizes, repeats=3):
+    """Time one plugin for each batch size and print the best run."""
+    try:
+        module = load_plugin(info)
+    except PluginError as e:
+        print(f"✗ {e}")
+        return
+
+    print(f"\n🔌 {getattr(module, 'NAME', info.name)} ({info.path})")
+    for size in sizes:
+        batch = synthetic_batch(size)
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            try:
+                run_plugin(module, batch)
+            except PluginError as e:
+                print(f"  ✗ {size:>10,} files: {e}")
+                break
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        else:
+            rate = size / best if best else float('inf')
+            print(f"  ✓ {size:>10,} files: {best * 1000:9.1f} ms  ({rate:,.0f} names/s)")
+
+
+def main():
+    """Benchmark every discovered plugin, or the plugin files given as arguments."""
+    if len(sys.argv) > 1:
+        plugins = discover_plugins([Path(arg).resolve().parent for arg in sys.argv[1:]])
+        wanted = {Path(arg).stem for arg in sys.argv[1:]}
+        plugins = [info for info in plugins if info.name in wanted]
+    else:
+        plugins = discover_plugins()
+
+    print("=" * 60)
+    print("Name Generator Plugin Benchmark")
+    print("=" * 60)
+
+    if not plugins:
+        print("No plugins found.")
+        return
+
+    for info in plugins:
+        benchmark_plugin(info, [1_000, 100_000, 1_000_000])
+
+    print()
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,12 @@ def build_executable():
         result = subprocess.run(pyinstaller_args, check=True)
         
         if result.returncode == 0:
+            # Plugins are loaded from a folder next to the executable
+            if Path("plugins").is_dir():
+                import shutil
+                shutil.copytree("plugins", Path("dist") / "plugins", dirs_exist_ok=True)
+                print("🔌 Copied plugins to dist/plugins/")
+            
             print()
             print("=" * 60)
             print("✅ Build Successful!")
@@ -0,0 +1,190 @@
+"""
+Checkpoints for long rename runs in the Batch File Renamer app.
+The plan is written once when a run starts; a small progress record is then
+replaced periodically, so an interrupted run can be resumed where it stopped
+without rescanning the items that were already done. Swaps finished between
+two progress records are appended to a journal, which is much cheaper than
+rewriting the progress record after every swap.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+
+
+CHECKPOINT_DIR = Path.home() / ".batch_file_renamer" / "checkpoint"
+
+# Where an interrupted run stopped: every index below next_index is resolved
+# except those in pending (waiting for a retry); problems maps the index of each
+# resolved-but-not-renamed item to its (status, message); swapped holds swaps
+# completed after the progress record, which must not be done again
+ResumePoint = namedtuple("ResumePoint", ["next_index", "pending", "problems", "swapped"],
+                         defaults=(frozenset(),))
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint is missing, corrupt or no longer matches the disk."""
+
+
+def plan_hash(plan):
+    """Return a SHA-256 hex digest identifying a rename plan."""
+    digest = hashlib.sha256()
+    for source, target in plan:
+        digest.update(os.fsencode(source) + b"\0" + os.fsencode(target) + b"\n")
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    """Write JSON atomically so a crash never leaves a half-written file."""
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class Checkpoint:
+    """Checkpoint files for one rename run, stored in a directory.
+
+    error holds the OSError that stopped checkpointing during a run (set by
+    apply_plan), or None.
+    """
+
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = Path(directory)
+        self.plan_path = self.directory / "plan.json"
+        self.progress_path = self.directory / "progress.json"
+        self.swaps_path = self.directory / "swaps.log"
+        self.hash = None
+        self.options = {}
+        self.error = None
+
+    def exists(self):
+        """Return True if an unfinished run has been recorded."""
+        return self.progress_path.exists()
+
+    def start(self, plan, options=None):
+        """Record a new run, replacing any previous checkpoint.
+
+        options is a JSON-serializable dict of run settings (such as the
+        transfer mode) that is restored into self.options by load().
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hash = plan_hash(plan)
+        self.options = dict(options or {})
+        _write_json(self.plan_path, {
+            "hash": self.hash,
+            "options": self.options,
+            "sources": [os.fspath(source) for source, _ in plan],
+            "targets": [os.fspath(target) for _, target in plan],
+        })
+        self.record(ResumePoint(0, [], {}))
+
+    def record(self, point):
+        """Replace the progress record with a new resume point.
+
+        The point must cover every swap in the journal, which is then emptied.
+        """
+        _write_json(self.progress_path, {
+            "hash": self.hash,
+            "next_index": point.next_index,
+            "pending": sorted(point.pending),
+            "problems": {str(index): list(problem) for index, problem in point.problems.items()},
+        })
+        # Emptied only after the new record is in place, so no swap is ever lost
+        with open(self.swaps_path, 'w', encoding='utf-8'):
+            pass
+
+    def record_swap(self, index):
+        """Append a completed swap to the journal.
+
+        Flushed but not fsync'ed: it survives the app crashing, and the next
+        record() makes it durable.
+        """
+        with open(self.swaps_path, 'a', encoding='utf-8') as f:
+            f.write(f"{self.hash} {index}\n")
+
+    def load(self):
+        """Return (plan, resume_point) for the recorded run.
+
+        Raises CheckpointError if the files are missing, unreadable or do not
+        belong together.
+        """
+        try:
+            with open(self.plan_path, encoding='utf-8') as f:
+                plan_data = json.load(f)
+            with open(self.progress_path, encoding='utf-8') as f:
+                progress_data = json.load(f)
+            journal = self._read_journal()
+        except (OSError, ValueError) as e:
+            raise CheckpointError(f"Cannot read checkpoint: {e}")
+
+        try:
+            plan = list(zip(plan_data["sources"], plan_data["targets"]))
+            point = ResumePoint(
+                progress_data["next_index"],
+                set(progress_data["pending"]),
+                {int(index): tuple(problem) for index, problem in progress_data["problems"].items()},
+                frozenset(index for run_hash, index in journal if run_hash == plan_data.get("hash")),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise CheckpointError(f"Checkpoint is incomplete: {e}")
+
+        self.hash = plan_hash(plan)
+        if self.hash != plan_data.get("hash") or self.hash != progress_data.get("hash"):
+            raise CheckpointError("Checkpoint does not match its recorded plan")
+        self.options = plan_data.get("options", {})
+        return plan, point
+
+    def _read_journal(self):
+        """Return the (plan hash, index) entries of the swap journal."""
+        entries = []
+        try:
+            with open(self.swaps_path, encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    # A crash can cut the last line short; only whole lines count
+                    if line.endswith("\n") and len(parts) == 2 and parts[1].isdigit():
+                        entries.append((parts[0], int(parts[1])))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def clear(self):
+        """Delete the checkpoint once a run has finished."""
+        for path in (self.progress_path, self.swaps_path, self.plan_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def validate_resume_point(plan, point, fs):
+    """Check a resume point against the current directory state.
+
+    Only the boundary is probed - the last item completed before the checkpoint
+    and the first item still to do - so completed items are never touched again.
+    Raises CheckpointError if the disk does not look like the recorded run.
+    """
+    if not 0 <= point.next_index <= len(plan):
+        raise CheckpointError("Checkpoint position is outside the plan")
+
+    # The last completed item should have been renamed (unless it was a recorded problem)
+    last = point.next_index - 1
+    while last >= 0 and (last in point.problems or last in point.pending):
+        last -= 1
+    if last >= 0:
+        source, target = plan[last]
+        if not fs.exists(target):
+            raise CheckpointError(
+                f"{Path(target).name} should already have been renamed but was not found"
+            )
+
+    # The next item should still be waiting (or have been renamed just after the checkpoint)
+    if point.next_index < len(plan):
+        source, target = plan[point.next_index]
+        if not fs.exists(source) and not fs.exists(target):
+            raise CheckpointError(f"{Path(source).name} was not found")
@@ -0,0 +1,213 @@
+"""
+Dry-run simulator for the Batch File Renamer app.
+Loads directory listings into an in-memory virtual filesystem and replays a
+rename plan against it, so every problem is reported before anything touches disk.
+"""
+
+import os
+from collections import namedtuple
+
+
+# Characters that cannot appear in a file name on Windows (plus '/' and NUL everywhere)
+WINDOWS_INVALID_CHARS = set('<>:"/\\|?*') | {chr(c) for c in range(32)}
+POSIX_INVALID_CHARS = {'/', '\0'}
+
+# Device names reserved by Windows regardless of extension
+WINDOWS_RESERVED_NAMES = (
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+
+# Common filesystem limits
+MAX_NAME_BYTES = 255
+MAX_PATH_LENGTH = 260 if os.name == 'nt' else 4096
+
+
+DryRunIssue = namedtuple("DryRunIssue", ["index", "kind", "source", "target", "message"])
+
+
+def validate_name(name, portable=True):
+    """Return a reason string if the file name is invalid, otherwise None."""
+    if not name or name in ('.', '..'):
+        return "empty file name"
+
+    invalid_chars = WINDOWS_INVALID_CHARS if portable else POSIX_INVALID_CHARS
+    if not invalid_chars.isdisjoint(name):
+        bad = sorted(invalid_chars.intersection(name))
+        return "contains invalid character(s): " + " ".join(repr(ch) for ch in bad)
+
+    # A UTF-8 character is at most 4 bytes, so short names never need encoding
+    if len(name) * 4 > MAX_NAME_BYTES and \
+            len(name.encode('utf-8', errors='surrogatepass')) > MAX_NAME_BYTES:
+        return f"longer than {MAX_NAME_BYTES} bytes"
+
+    if portable:
+        if name.split('.')[0].upper() in WINDOWS_RESERVED_NAMES:
+            return "uses a name reserved by Windows"
+        if name[-1] in ' .':
+            return "ends with a space or dot"
+
+    return None
+
+
+class VirtualFileSystem:
+    """In-memory view of one or more directories.
+
+    Only names are tracked (a file or folder with the target name blocks a rename
+    either way), keyed by directory. With autoload enabled a directory is listed
+    from disk the first time it is touched; otherwise unknown directories start
+    empty, which makes the class usable as a fast synthetic test backend.
+    With a scheduler (an IOScheduler) directory listings go through its limits.
+    """
+
+    def __init__(self, autoload=False, case_sensitive=None, scheduler=None):
+        self.autoload = autoload
+        self.scheduler = scheduler
+        self.case_sensitive = (os.name != 'nt') if case_sensitive is None else case_sensitive
+        self._dirs = {}
+        self._norm_cache = {}
+
+    def _key(self, name):
+        return name if self.case_sensitive else name.lower()
+
+    def _split(self, path):
+        path = os.fspath(path)
+        if os.altsep:
+            path = path.replace(os.altsep, os.sep)
+        cut = path.rfind(os.sep) + 1
+        raw_dir = path[:cut]
+        directory = self._norm_cache.get(raw_dir)
+        if directory is None:
+            directory = os.path.normpath(raw_dir or '.')
+            self._norm_cache[raw_dir] = directory
+        return directory, path[cut:]
+
+    def _entries(self, directory):
+        entries = self._dirs.get(directory)
+        if entries is None:
+            entries = set()
+            if self.autoload:
+                try:
+                    if self.scheduler is None:
+                        self._scan(directory, entries)
+                    else:
+                        with self.scheduler.operation(directory):
+                            self._scan(directory, entries)
+                except OSError:
+                    pass
+            self._dirs[directory] = entries
+        return entries
+
+    def _scan(self, directory, entries):
+        with os.scandir(directory) as it:
+            entries.update(self._key(entry.name) for entry in it)
+
+    def load_directory(self, directory):
+        """Load (or reload) a directory listing from disk."""
+        directory = os.path.normpath(os.fspath(directory))
+        self._dirs.pop(directory, None)
+        autoload, self.autoload = self.autoload, True
+        try:
+            self._entries(directory)
+        finally:
+            self.autoload = autoload
+
+    def add_files(self, paths):
+        """Register synthetic files without touching the disk."""
+        for path in paths:
+            directory, name = self._split(path)
+            self._entries(directory).add(self._key(name))
+
+    def exists(self, path):
+        """Return True if a file or folder with this path exists."""
+        directory, name = self._split(path)
+        return self._key(name) in self._entries(directory)
+
+    def rename(self, source, target):
+        """Move an entry, mirroring os.rename (raises if the source is missing)."""
+        self._move(self._split(source), self._split(target))
+
+    def _move(self, source, target):
+        src_entries = self._entries(source[0])
+        src_key = self._key(source[1])
+        if src_key not in src_entries:
+            raise FileNotFoundError(2, "No such file or directory",
+                                    os.path.join(*source))
+        src_entries.discard(src_key)
+        self._entries(target[0]).add(self._key(target[1]))
+
+    def file_count(self):
+        """Return the number of entries currently tracked."""
+        return sum(len(entries) for entries in self._dirs.values())
+
+
+def simulate_plan(plan, vfs=None, portable=True, max_path_length=MAX_PATH_LENGTH,
+                  keep_sources=False, swaps=None):
+    """Replay a rename plan in order against a virtual filesystem.
+
+    plan is a sequence of (source, target) paths. Returns a list of DryRunIssue
+    covering missing sources, collisions between plan entries, overwrites of
+    existing files, over-long paths and invalid names. The virtual filesystem is
+    updated as if every valid step had been applied; with keep_sources the steps
+    are treated as copies and the sources stay in place. swaps maps the first
+    entry of each name swap (from rename_engine.find_swaps) to the second; such
+    pairs are exchanged in one step instead of being reported as overwrites.
+    """
+    if vfs is None:
+        vfs = VirtualFileSystem(autoload=True)
+
+    issues = []
+    claimed = {}
+    swapped = set()
+    if swaps:
+        swapped.update(swaps)
+        swapped.update(swaps.values())
+
+    for index, (source, target) in enumerate(plan):
+        source = os.fspath(source)
+        target = os.fspath(target)
+        source_dir, source_name = source_parts = vfs._split(source)
+        target_dir, target_name = target_parts = vfs._split(target)
+        source_key = vfs._key(source_name)
+        target_key = (target_dir, vfs._key(target_name))
+        blocked = False
+
+        reason = validate_name(target_name, portable)
+        if reason:
+            issues.append(DryRunIssue(index, "invalid_name", source, target,
+                                      f"{target_name}: {reason}"))
+            blocked = True
+
+        target_length = len(target) if os.path.isabs(target) else len(os.path.abspath(target))
+        if target_length >= max_path_length:
+            issues.append(DryRunIssue(index, "path_too_long", source, target,
+                                      f"path exceeds {max_path_length} characters"))
+            blocked = True
+
+        if source_key not in vfs._entries(source_dir):
+            issues.append(DryRunIssue(index, "missing", source, target,
+                                      "source file does not exist"))
+            continue
+
+        collided = target_key in claimed
+        if collided:
+            issues.append(DryRunIssue(index, "collision", source, target,
+                                      f"same target as item {claimed[target_key] + 1}"))
+            blocked = True
+        claimed[target_key] = index
+
+        # An exchange keeps both names in place, so it neither overwrites nor moves
+        same_file = index in swapped or (source_dir == target_dir and source_key == target_key[1])
+        if not collided and not same_file and target_key[1] in vfs._entries(target_dir):
+            issues.append(DryRunIssue(index, "overwrite", source, target,
+                                      "target already exists"))
+            blocked = True
+
+        if not blocked and not same_file:
+            if keep_sources:
+                vfs._entries(target_dir).add(target_key[1])
+            else:
+                vfs._move(source_parts, target_parts)
+
+    return issues
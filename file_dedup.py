@@ -0,0 +1,60 @@
+"""
+Input deduplication for the Batch File Renamer app.
+Resolves every selected path to the file it refers to, (st_dev, st_ino), via
+the shared stat pass, so the same file picked twice - directly, through a
+symlink or through a hard link - is only renamed once. The index is kept
+between selections, so merging another selection only costs its own files.
+"""
+
+import os
+from collections import namedtuple
+
+
+# unique: new paths in selection order; duplicates: (path, path already selected)
+DedupReport = namedtuple("DedupReport", ["unique", "duplicates"])
+
+
+class FileIndex:
+    """Hash index of the files in a selection, keyed by (st_dev, st_ino).
+
+    Files that cannot be stat'ed, or whose filesystem reports no inode
+    number, are keyed by their normalized absolute path instead.
+    """
+
+    def __init__(self, stat_cache):
+        self.stat_cache = stat_cache
+        self._paths = {}
+
+    def __len__(self):
+        return len(self._paths)
+
+    def identity(self, path):
+        """Return the key identifying the file at path."""
+        stat = self.stat_cache.stat(path)
+        if stat is not None and stat.st_ino:
+            return stat.st_dev, stat.st_ino
+        return os.path.normcase(os.path.abspath(path))
+
+    def add(self, paths):
+        """Add paths to the index and return a DedupReport.
+
+        Runs in O(len(paths)): each path is stat'ed once (through the cache)
+        and looked up in a dict.
+        """
+        unique = []
+        duplicates = []
+        known = self._paths
+        identity = self.identity
+        for path in paths:
+            key = identity(path)
+            existing = known.get(key)
+            if existing is None:
+                known[key] = path
+                unique.append(path)
+            else:
+                duplicates.append((path, existing))
+        return DedupReport(unique, duplicates)
+
+    def clear(self):
+        """Forget every file in the index."""
+        self._paths.clear()
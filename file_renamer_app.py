@@ -1,15 +1,272 @@
 import sys
 import os
+import re
+import time
+from bisect import bisect_left
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QLineEdit, 
-                             QTableWidget, QTableWidgetItem, QFileDialog, 
+                             QTableWidget, QTableWidgetItem, QTableView, QFileDialog, 
                              QSpinBox, QCheckBox, QMessageBox, QGroupBox,
                              QHeaderView, QRadioButton, QButtonGroup, QTextEdit,
-                             QSplitter, QAbstractItemView)
-from PyQt6.QtCore import Qt, QUrl
+                             QSplitter, QAbstractItemView, QComboBox, QDialog,
+                             QDialogButtonBox, QProgressDialog)
+from PyQt6.QtCore import (Qt, QUrl, QItemSelection, QItemSelectionModel, QAbstractTableModel,
+                          QModelIndex, QTimer, pyqtSignal)
 from PyQt6.QtGui import QIcon, QPalette, QColor, QFont, QPixmap, QDesktopServices
+from dry_run import simulate_plan, VirtualFileSystem
+from rename_engine import (apply_plan, count_results, find_swaps, LocalFileSystem,
+                           STATUS_RENAMED, STATUS_SKIPPED, STATUS_FAILED, STATUS_NOT_STARTED)
+from atomic_rename import create_local_filesystem, HAVE_RENAMEAT2
+from io_scheduler import IOScheduler, ScheduledFileSystem
+from checkpoint import Checkpoint, CheckpointError, validate_resume_point
+from file_stats import StatCache
+from file_dedup import FileIndex
+from name_plugins import NameBatch, PluginError, discover_plugins, load_plugin, run_plugin
+from path_templates import PathTemplate, DirectoryCache, TEMPLATE_FIELDS, target_directories
+from transfer import (TransferFileSystem, TRANSFER_MODES, TRANSFER_WORKERS, MODE_RENAME,
+                      MODE_COPY, MODE_MOVE)
+from sanitize import NameSanitizer
+from name_filter import NameIndex, FILTER_MODES, FILTER_COLUMNS
+from reorder import block_range, move_block, drop_target
+from sequence_groups import GroupedSequence, group_keys, GROUP_MODES, GROUP_NONE
+
+
+class PreviewModel(QAbstractTableModel):
+    """Read-only model showing the preview columns through a row mapping.
+    
+    rows lists the positions in the selection ("source rows") that the filter
+    lets through, in order, or is None to show every row. Filtering swaps that
+    list in one step instead of hiding table rows one by one.
+    """
+    
+    HEADERS = ("Original Name", "New Name", "Group")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = ([], [], [])
+        self.rows = None
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns[0]) if self.rows is None else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def source_row(self, row):
+        """Return the position in the selection shown at view row row."""
+        return row if self.rows is None else self.rows[row]
+    
+    def view_row(self, source_row):
+        """Return the view row showing source_row, or -1 if it is filtered out."""
+        if self.rows is None:
+            return source_row
+        position = bisect_left(self.rows, source_row)
+        if position < len(self.rows) and self.rows[position] == source_row:
+            return position
+        return -1
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self.columns[index.column()][self.source_row(index.row())]
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        # Filtered rows keep their position in the selection as row number
+        return str(self.source_row(section) + 1)
+    
+    def flags(self, index):
+        if not index.isValid():
+            # Dropping below the last row moves the files to the end
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
+    
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+    
+    def set_columns(self, original_names, new_names, keys):
+        """Show new column lists, with every row visible."""
+        self.beginResetModel()
+        self.columns = (original_names, new_names, keys)
+        self.rows = None
+        self.endResetModel()
+    
+    def set_rows(self, rows):
+        """Show only the given source rows (None for all); returns False if nothing changed."""
+        if rows == self.rows:
+            return False
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+        return True
+    
+    def source_rows_changed(self, start, stop):
+        """Refresh the view rows showing source rows start..stop after their text changed."""
+        if self.rows is None:
+            first, last = start, stop - 1
+        else:
+            first, last = bisect_left(self.rows, start), bisect_left(self.rows, stop) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, first, last)
+
+
+class PreviewTable(QTableView):
+    """Preview table that reports internal drag-and-drop as a block move request.
+    
+    Rows are reported as positions in the selection, whatever the filter hides.
+    """
+    
+    rows_dropped = pyqtSignal(list, int)
+    selection_changed = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(PreviewModel(self))
+    
+    def selected_rows(self):
+        """Return the selected source rows in ascending order."""
+        model = self.model()
+        return sorted(model.source_row(index.row()) for index in self.selectionModel().selectedRows())
+    
+    def current_source_row(self):
+        """Return the source row that was clicked last, or -1."""
+        index = self.currentIndex()
+        return self.model().source_row(index.row()) if index.isValid() else -1
+    
+    def select_source_rows(self, rows, current):
+        """Select the visible ones of the given source rows and make current the current row."""
+        model = self.model()
+        last_column = model.columnCount() - 1
+        selection = QItemSelection()
+        run_start = run_end = None
+        # One range per run of adjacent view rows keeps large selections cheap
+        for row in rows:
+            view_row = model.view_row(row)
+            if view_row < 0:
+                continue
+            if run_end is not None and view_row == run_end + 1:
+                run_end = view_row
+                continue
+            if run_start is not None:
+                selection.select(model.index(run_start, 0), model.index(run_end, last_column))
+            run_start = run_end = view_row
+        if run_start is not None:
+            selection.select(model.index(run_start, 0), model.index(run_end, last_column))
+        
+        current_row = model.view_row(current) if current >= 0 else -1
+        if current_row >= 0:
+            self.selectionModel().setCurrentIndex(model.index(current_row, 0),
+                                                  QItemSelectionModel.SelectionFlag.NoUpdate)
+        self.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+    
+    def set_rows(self, rows):
+        """Filter to the given source rows, keeping the selection of rows that stay visible."""
+        selected = self.selected_rows()
+        current = self.current_source_row()
+        if self.model().set_rows(rows):
+            self.select_source_rows(selected, current)
+    
+    def selectionChanged(self, selected, deselected):
+        super().selectionChanged(selected, deselected)
+        self.selection_changed.emit()
+    
+    def dropEvent(self, event):
+        """Emit the dragged rows and the source row they were dropped before."""
+        if event.source() is not self:
+            event.ignore()
+            return
+        
+        model = self.model()
+        index = self.indexAt(event.position().toPoint())
+        if not index.isValid():
+            drop_row = len(model.columns[0])
+        else:
+            drop_row = model.source_row(index.row())
+            if self.dropIndicatorPosition() == QAbstractItemView.DropIndicatorPosition.BelowItem:
+                drop_row += 1
+        
+        # The app reorders its own lists, so Qt must not move or clear any rows
+        event.setDropAction(Qt.DropAction.IgnoreAction)
+        event.accept()
+        self.rows_dropped.emit(self.selected_rows(), drop_row)
+
+
+class RenameResultsDialog(QDialog):
+    """Dialog listing the outcome of every file in a rename run."""
+    
+    def __init__(self, results, parent=None, rate_summary="", resumable=True):
+        super().__init__(parent)
+        self.results = results
+        self.setWindowTitle("Rename Results")
+        self.setMinimumSize(800, 450)
+        
+        layout = QVBoxLayout(self)
+        
+        counts = count_results(results)
+        summary = (f"Renamed {counts[STATUS_RENAMED]} file(s), "
+                   f"skipped {counts[STATUS_SKIPPED]}, "
+                   f"failed {counts[STATUS_FAILED]}.")
+        if counts[STATUS_NOT_STARTED]:
+            summary += (f"\nThe run was stopped before {counts[STATUS_NOT_STARTED]} file(s) "
+                        "were renamed. ")
+            summary += ("Use ⏯️ Resume to continue." if resumable else
+                        "It has no checkpoint, so rename the remaining files again.")
+        if rate_summary:
+            summary += f"\n{rate_summary}"
+        summary_label = QLabel(summary)
+        summary_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        layout.addWidget(summary_label)
+        
+        self.problems_only_check = QCheckBox("Show only files that were not renamed")
+        self.problems_only_check.setChecked(True)
+        self.problems_only_check.toggled.connect(self.populate_table)
+        layout.addWidget(self.problems_only_check)
+        
+        self.results_table = QTableWidget()
+        self.results_table.setColumnCount(5)
+        self.results_table.setHorizontalHeaderLabels(["Original Name", "New Name", "Status", "Attempts", "Details"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.results_table.setAlternatingRowColors(True)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.results_table)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        
+        self.populate_table()
+    
+    def populate_table(self):
+        """Fill the table with all results, or only the problems."""
+        if self.problems_only_check.isChecked():
+            rows = [result for result in self.results if result.status != STATUS_RENAMED]
+        else:
+            rows = self.results
+        
+        self.results_table.setRowCount(len(rows))
+        for i, result in enumerate(rows):
+            status_item = QTableWidgetItem(result.status)
+            if result.status == STATUS_FAILED:
+                status_item.setForeground(QColor("#f44336"))
+            elif result.status == STATUS_SKIPPED:
+                status_item.setForeground(QColor("#FF9800"))
+            
+            self.results_table.setItem(i, 0, QTableWidgetItem(Path(result.source).name))
+            self.results_table.setItem(i, 1, QTableWidgetItem(Path(result.target).name))
+            self.results_table.setItem(i, 2, status_item)
+            self.results_table.setItem(i, 3, QTableWidgetItem(str(result.attempts)))
+            self.results_table.setItem(i, 4, QTableWidgetItem(result.message))
 
 
 class FileRenamerApp(QMainWindow):
@@ -18,6 +275,14 @@ class FileRenamerApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.selected_files = []
+        self.original_names = []
+        self.new_names = []
+        # Every filesystem operation goes through one scheduler (limits set in the UI)
+        self.io_scheduler = IOScheduler()
+        self.stat_cache = StatCache(self.io_scheduler)
+        self.file_index = FileIndex(self.stat_cache)
+        self.name_index = None
+        self.sequence = None
         self.init_ui()
         self.center_window()
         
@@ -52,12 +317,19 @@ class FileRenamerApp(QMainWindow):
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_layout.addWidget(title_label)
         
-        # File selection button
+        # File selection buttons
+        select_layout = QHBoxLayout()
         select_btn = QPushButton("📂 Select Files")
         select_btn.setToolTip("Click to select multiple files to rename")
         select_btn.clicked.connect(self.select_files)
         select_btn.setMinimumHeight(40)
-        left_layout.addWidget(select_btn)
+        add_btn = QPushButton("➕ Add Files")
+        add_btn.setToolTip("Add more files to the current selection (files already in it are skipped)")
+        add_btn.clicked.connect(self.add_files)
+        add_btn.setMinimumHeight(40)
+        select_layout.addWidget(select_btn, 3)
+        select_layout.addWidget(add_btn, 1)
+        left_layout.addLayout(select_layout)
         
         # Renaming options group
         options_group = QGroupBox("Renaming Options")
@@ -98,8 +370,17 @@ class FileRenamerApp(QMainWindow):
         self.start_number_spin.setMaximum(9999)
         self.start_number_spin.setValue(1)
         self.start_number_spin.setToolTip("Choose the starting number for sequential naming")
+        group_label = QLabel("Restart:")
+        self.group_combo = QComboBox()
+        self.group_combo.addItems(GROUP_MODES)
+        self.group_combo.setToolTip("Number the whole selection in one sequence, or restart numbering per folder, extension or modification date")
+        self.pad_numbers_check = QCheckBox("Zero-pad")
+        self.pad_numbers_check.setToolTip("Pad numbers with zeros to the width of the largest number in their group (e.g. 01..12)")
         number_layout.addWidget(number_label)
         number_layout.addWidget(self.start_number_spin)
+        number_layout.addWidget(group_label)
+        number_layout.addWidget(self.group_combo)
+        number_layout.addWidget(self.pad_numbers_check)
         number_layout.addStretch()
         options_layout.addLayout(number_layout)
         
@@ -112,6 +393,111 @@ class FileRenamerApp(QMainWindow):
         datetime_layout.addStretch()
         options_layout.addLayout(datetime_layout)
         
+        # Sanitization options
+        sanitize_layout = QHBoxLayout()
+        self.sanitize_check = QCheckBox("Sanitize names")
+        self.sanitize_check.setChecked(True)
+        self.sanitize_check.setToolTip("Replace invalid characters, normalize Unicode and shorten names over 255 bytes")
+        replacement_label = QLabel("Replace invalid with:")
+        self.replacement_input = QLineEdit("_")
+        self.replacement_input.setMaxLength(3)
+        self.replacement_input.setMaximumWidth(50)
+        self.replacement_input.setToolTip("Text used in place of invalid characters (leave empty to drop them)")
+        normalization_label = QLabel("Unicode:")
+        self.normalization_combo = QComboBox()
+        self.normalization_combo.addItems(["NFC", "NFD", "None"])
+        self.normalization_combo.setToolTip("Unicode normalization form applied to new names")
+        sanitize_layout.addWidget(self.sanitize_check)
+        sanitize_layout.addWidget(replacement_label)
+        sanitize_layout.addWidget(self.replacement_input)
+        sanitize_layout.addWidget(normalization_label)
+        sanitize_layout.addWidget(self.normalization_combo)
+        sanitize_layout.addStretch()
+        options_layout.addLayout(sanitize_layout)
+        
+        # Name generator - built-in rules or a plugin
+        generator_layout = QHBoxLayout()
+        generator_label = QLabel("Name Generator:")
+        generator_label.setMinimumWidth(120)
+        self.generator_combo = QComboBox()
+        self.generator_combo.addItem("Built-in", None)
+        # Plugins are only listed here; each one is imported the first time it is used
+        for plugin in discover_plugins():
+            self.generator_combo.addItem(f"🔌 {plugin.name}", plugin)
+        self.generator_combo.setToolTip("Use the built-in naming rules or a plugin from the plugins folder")
+        self.generator_combo.currentIndexChanged.connect(self.on_generator_changed)
+        generator_layout.addWidget(generator_label)
+        generator_layout.addWidget(self.generator_combo)
+        generator_layout.addStretch()
+        options_layout.addLayout(generator_layout)
+        
+        # Folder template - optional subfolders for each file
+        template_layout = QHBoxLayout()
+        template_label = QLabel("Folder Template:")
+        template_label.setMinimumWidth(120)
+        self.template_input = QLineEdit()
+        self.template_input.setPlaceholderText("Optional, e.g. {date:%Y}/{date:%m}/{name}")
+        self.template_input.setToolTip(
+            "Sort files into subfolders. Use '/' between folders. Available fields:\n"
+            + "\n".join(f"{{{field}}} - {description}" for field, description in TEMPLATE_FIELDS.items())
+        )
+        template_layout.addWidget(template_label)
+        template_layout.addWidget(self.template_input)
+        options_layout.addLayout(template_layout)
+        
+        # Output options - rename in place, or copy/move into a destination folder
+        output_layout = QHBoxLayout()
+        output_label = QLabel("Output:")
+        output_label.setMinimumWidth(120)
+        self.transfer_mode_combo = QComboBox()
+        self.transfer_mode_combo.addItems(TRANSFER_MODES)
+        self.transfer_mode_combo.setToolTip("Rename files where they are, or write renamed copies/moves into another folder")
+        self.transfer_mode_combo.currentIndexChanged.connect(self.on_transfer_mode_changed)
+        self.destination_input = QLineEdit()
+        self.destination_input.setPlaceholderText("Destination folder")
+        self.destination_input.setEnabled(False)
+        self.destination_btn = QPushButton("📁 Browse")
+        self.destination_btn.setToolTip("Choose the destination folder")
+        self.destination_btn.clicked.connect(self.select_destination)
+        self.destination_btn.setEnabled(False)
+        output_layout.addWidget(output_label)
+        output_layout.addWidget(self.transfer_mode_combo)
+        output_layout.addWidget(self.destination_input)
+        output_layout.addWidget(self.destination_btn)
+        options_layout.addLayout(output_layout)
+        
+        # I/O limits - keep large runs from saturating shared storage
+        io_layout = QHBoxLayout()
+        io_label = QLabel("I/O Limits:")
+        io_label.setMinimumWidth(120)
+        self.ops_limit_spin = QSpinBox()
+        self.ops_limit_spin.setRange(0, 100000)
+        self.ops_limit_spin.setSuffix(" ops/s")
+        self.ops_limit_spin.setSpecialValueText("No ops limit")
+        self.ops_limit_spin.setToolTip("Maximum filesystem operations per second (stat, rename, mkdir, ...)")
+        self.bytes_limit_spin = QSpinBox()
+        self.bytes_limit_spin.setRange(0, 100000)
+        self.bytes_limit_spin.setSuffix(" MB/s")
+        self.bytes_limit_spin.setSpecialValueText("No MB/s limit")
+        self.bytes_limit_spin.setToolTip("Maximum copy throughput in megabytes per second")
+        self.mount_limit_spin = QSpinBox()
+        self.mount_limit_spin.setRange(0, 64)
+        self.mount_limit_spin.setSuffix(" per mount")
+        self.mount_limit_spin.setSpecialValueText("No mount cap")
+        self.mount_limit_spin.setToolTip("Maximum operations running at the same time on each drive or network share")
+        self.low_priority_check = QCheckBox("Low priority")
+        self.low_priority_check.setToolTip("Use idle I/O priority so other programs' disk access goes first (like ionice -c3)")
+        for spin in (self.ops_limit_spin, self.bytes_limit_spin, self.mount_limit_spin):
+            spin.valueChanged.connect(self.apply_io_settings)
+        self.low_priority_check.toggled.connect(self.apply_io_settings)
+        io_layout.addWidget(io_label)
+        io_layout.addWidget(self.ops_limit_spin)
+        io_layout.addWidget(self.bytes_limit_spin)
+        io_layout.addWidget(self.mount_limit_spin)
+        io_layout.addWidget(self.low_priority_check)
+        io_layout.addStretch()
+        options_layout.addLayout(io_layout)
+        
         options_group.setLayout(options_layout)
         left_layout.addWidget(options_group)
         
@@ -120,35 +506,98 @@ class FileRenamerApp(QMainWindow):
         preview_label = QLabel("Preview:")
         preview_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         preview_header_layout.addWidget(preview_label)
+        
+        # Filter box - narrows the visible rows without changing the numbering order
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("🔎 Filter...")
+        self.filter_input.setToolTip("Show only rows whose names match (numbering is not affected)")
+        self.filter_input.setClearButtonEnabled(True)
+        # Typing restarts a short timer, so a burst of keystrokes costs one search
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        self.filter_mode_combo = QComboBox()
+        self.filter_mode_combo.addItems(FILTER_MODES)
+        self.filter_mode_combo.setToolTip("Match by substring, glob pattern (*.jpg) or regular expression")
+        self.filter_mode_combo.currentIndexChanged.connect(self.apply_filter)
+        self.filter_column_combo = QComboBox()
+        self.filter_column_combo.addItems(FILTER_COLUMNS)
+        self.filter_column_combo.setToolTip("Which name column to search")
+        self.filter_column_combo.currentIndexChanged.connect(self.apply_filter)
+        self.filter_status_label = QLabel("")
+        self.filter_status_label.setStyleSheet("color: #757575;")
+        preview_header_layout.addWidget(self.filter_input)
+        preview_header_layout.addWidget(self.filter_mode_combo)
+        preview_header_layout.addWidget(self.filter_column_combo)
+        preview_header_layout.addWidget(self.filter_status_label)
         preview_header_layout.addStretch()
         
-        # Reorder buttons
+        left_layout.addLayout(preview_header_layout)
+        
+        # Reorder buttons - all of them move every selected row as one block
+        reorder_layout = QHBoxLayout()
+        
         self.move_up_btn = QPushButton("⬆️ Move Up")
-        self.move_up_btn.setToolTip("Move selected file up in the list")
+        self.move_up_btn.setToolTip("Move selected files up in the list")
         self.move_up_btn.clicked.connect(self.move_file_up)
         self.move_up_btn.setEnabled(False)
         self.move_up_btn.setMaximumWidth(120)
         
         self.move_down_btn = QPushButton("⬇️ Move Down")
-        self.move_down_btn.setToolTip("Move selected file down in the list")
+        self.move_down_btn.setToolTip("Move selected files down in the list")
         self.move_down_btn.clicked.connect(self.move_file_down)
         self.move_down_btn.setEnabled(False)
         self.move_down_btn.setMaximumWidth(120)
         
-        preview_header_layout.addWidget(self.move_up_btn)
-        preview_header_layout.addWidget(self.move_down_btn)
-        
-        left_layout.addLayout(preview_header_layout)
-        
-        self.preview_table = QTableWidget()
-        self.preview_table.setColumnCount(2)
-        self.preview_table.setHorizontalHeaderLabels(["Original Name", "New Name"])
+        self.move_top_btn = QPushButton("⏫ Top")
+        self.move_top_btn.setToolTip("Move selected files to the top of the list")
+        self.move_top_btn.clicked.connect(self.move_files_to_top)
+        self.move_top_btn.setEnabled(False)
+        self.move_top_btn.setMaximumWidth(120)
+        
+        self.move_bottom_btn = QPushButton("⏬ Bottom")
+        self.move_bottom_btn.setToolTip("Move selected files to the bottom of the list")
+        self.move_bottom_btn.clicked.connect(self.move_files_to_bottom)
+        self.move_bottom_btn.setEnabled(False)
+        self.move_bottom_btn.setMaximumWidth(120)
+        
+        self.move_position_spin = QSpinBox()
+        self.move_position_spin.setMinimum(1)
+        self.move_position_spin.setMaximum(1)
+        self.move_position_spin.setToolTip("Position the first selected file should move to")
+        
+        self.move_to_btn = QPushButton("↪️ Move To")
+        self.move_to_btn.setToolTip("Move selected files so the first one lands at the chosen position")
+        self.move_to_btn.clicked.connect(self.move_files_to_position)
+        self.move_to_btn.setEnabled(False)
+        self.move_to_btn.setMaximumWidth(120)
+        
+        reorder_layout.addStretch()
+        reorder_layout.addWidget(self.move_up_btn)
+        reorder_layout.addWidget(self.move_down_btn)
+        reorder_layout.addWidget(self.move_top_btn)
+        reorder_layout.addWidget(self.move_bottom_btn)
+        reorder_layout.addWidget(self.move_position_spin)
+        reorder_layout.addWidget(self.move_to_btn)
+        
+        left_layout.addLayout(reorder_layout)
+        
+        self.preview_table = PreviewTable()
+        self.preview_model = self.preview_table.model()
+        self.preview_table.setColumnHidden(2, True)
         self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.preview_table.setAlternatingRowColors(True)
-        self.preview_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.preview_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.preview_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.preview_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.preview_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.preview_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.preview_table.setDragEnabled(True)
+        self.preview_table.setAcceptDrops(True)
+        self.preview_table.setDropIndicatorShown(True)
+        self.preview_table.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.preview_table.rows_dropped.connect(self.on_rows_dropped)
+        self.preview_table.selection_changed.connect(self.on_selection_changed)
         left_layout.addWidget(self.preview_table)
         
         # Action buttons
@@ -172,8 +621,21 @@ class FileRenamerApp(QMainWindow):
         reset_btn.setMinimumHeight(40)
         reset_btn.setStyleSheet("background-color: #f44336; color: white;")
         
+        dry_run_btn = QPushButton("🧪 Dry Run")
+        dry_run_btn.setToolTip("Simulate the rename in memory and report problems without touching any files")
+        dry_run_btn.clicked.connect(self.dry_run)
+        dry_run_btn.setMinimumHeight(40)
+        
+        self.resume_btn = QPushButton("⏯️ Resume")
+        self.resume_btn.setToolTip("Continue an interrupted rename from its last checkpoint")
+        self.resume_btn.clicked.connect(self.resume_rename)
+        self.resume_btn.setMinimumHeight(40)
+        self.resume_btn.setEnabled(Checkpoint().exists())
+        
         button_layout.addWidget(preview_btn)
+        button_layout.addWidget(dry_run_btn)
         button_layout.addWidget(rename_btn)
+        button_layout.addWidget(self.resume_btn)
         button_layout.addWidget(reset_btn)
         
         left_layout.addLayout(button_layout)
@@ -273,21 +735,21 @@ class FileRenamerApp(QMainWindow):
             QLineEdit:focus, QSpinBox:focus {
                 border: 2px solid #2196F3;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 2px solid #e0e0e0;
                 border-radius: 5px;
                 color: #212121;
                 alternate-background-color: #E3F2FD;
             }
-            QTableWidget::item {
+            QTableView::item {
                 color: #212121;
                 padding: 5px;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 color: #212121;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #FFD54F;
                 color: #212121;
                 font-weight: bold;
@@ -377,34 +839,108 @@ class FileRenamerApp(QMainWindow):
         )
         
         if files:
-            self.selected_files = files
-            QMessageBox.information(
-                self,
-                "Files Selected",
-                f"Successfully selected {len(files)} file(s)."
-            )
-            self.preview_rename()
+            self.selected_files = []
+            self.stat_cache.clear()
+            self.file_index = FileIndex(self.stat_cache)
+            self.merge_files(files, "Files Selected")
+    
+    def add_files(self):
+        """Open file dialog to add files to the current selection."""
+        files, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Add Files to Rename",
+            "",
+            "All Files (*.*)"
+        )
+        
+        if files:
+            self.merge_files(files, "Files Added")
+    
+    def merge_files(self, files, title):
+        """Append files to the selection, collapsing any that are already in it."""
+        # The same file can arrive twice, via a symlink or via a hard link;
+        # it must only be renamed once
+        report = self.file_index.add(files)
+        self.selected_files.extend(report.unique)
+        
+        message = f"Successfully selected {len(report.unique)} file(s)."
+        if report.duplicates:
+            message += (f"\n\n{len(report.duplicates)} duplicate(s) were collapsed "
+                        "(same file as one already selected):\n"
+                        + self.format_duplicates(report.duplicates))
+        QMessageBox.information(self, title, message)
+        self.preview_rename()
+    
+    def format_duplicates(self, duplicates, limit=10):
+        """Format (path, already selected path) pairs as a readable summary."""
+        lines = [f"{Path(path).name} → {Path(existing).name}"
+                 if Path(path).name != Path(existing).name else Path(path).name
+                 for path, existing in duplicates[:limit]]
+        if len(duplicates) > limit:
+            lines.append(f"... and {len(duplicates) - limit} more")
+        return "\n".join(lines)
+    
+    def select_destination(self):
+        """Open folder dialog to choose where copied or moved files are written."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Destination Folder")
+        if folder:
+            self.destination_input.setText(folder)
+    
+    def on_transfer_mode_changed(self):
+        """Enable the destination controls only for copy/move modes."""
+        in_place = self.transfer_mode_combo.currentText() == MODE_RENAME
+        self.destination_input.setEnabled(not in_place)
+        self.destination_btn.setEnabled(not in_place)
+    
+    def apply_io_settings(self):
+        """Pass the I/O limits from the UI to the scheduler."""
+        self.io_scheduler.configure(
+            ops_per_second=self.ops_limit_spin.value(),
+            bytes_per_second=self.bytes_limit_spin.value() * 1024 * 1024,
+            max_per_mount=self.mount_limit_spin.value(),
+            low_priority=self.low_priority_check.isChecked()
+        )
+    
+    def format_io_rates(self, rates):
+        """Describe the achieved I/O rates, e.g. for tuning the limits."""
+        text = f"{rates.ops} I/O operations, {rates.ops_per_second:.0f} ops/s"
+        if rates.bytes:
+            text += f", {self.format_file_size(rates.bytes_per_second)}/s"
+        return text
+    
+    def on_generator_changed(self):
+        """Load the chosen plugin and show its description."""
+        plugin = self.generator_combo.currentData()
+        if plugin is None:
+            self.generator_combo.setToolTip("Use the built-in naming rules or a plugin from the plugins folder")
+            return
+        try:
+            module = load_plugin(plugin)
+        except PluginError as e:
+            QMessageBox.warning(self, "Plugin Error", str(e))
+            self.generator_combo.setCurrentIndex(0)
+            return
+        self.generator_combo.setToolTip(getattr(module, 'DESCRIPTION', plugin.name))
     
     def show_file_preview(self):
         """Show preview of the selected file."""
-        selected_items = self.preview_table.selectedItems()
-        if not selected_items:
+        if not self.preview_table.selectionModel().hasSelection():
             self.file_info_label.setText("Select a file to preview")
             self.preview_text.clear()
             self.preview_image_label.hide()
             self.preview_text.show()
             return
         
-        # Get the row of the selected item
-        row = selected_items[0].row()
-        if row >= len(self.selected_files):
+        # Preview the row that was clicked last
+        row = self.preview_table.current_source_row()
+        if row < 0 or row >= len(self.selected_files):
             return
         
         file_path = Path(self.selected_files[row])
         
-        # Update file info
-        file_size = file_path.stat().st_size
-        size_str = self.format_file_size(file_size)
+        # Update file info (through the stat cache, so the scheduler limits apply)
+        stat = self.stat_cache.stat(file_path)
+        size_str = self.format_file_size(stat.st_size) if stat is not None else "unknown"
         self.file_info_label.setText(
             f"📁 {file_path.name}\n"
             f"📊 Size: {size_str} | Type: {file_path.suffix.upper() or 'No extension'}"
@@ -453,61 +989,105 @@ class FileRenamerApp(QMainWindow):
     
     def on_selection_changed(self):
         """Handle table selection change to enable/disable move buttons and show preview."""
-        selected_items = self.preview_table.selectedItems()
+        rows = self.preview_table.selected_rows()
         
-        if selected_items:
-            row = selected_items[0].row()
-            total_rows = self.preview_table.rowCount()
+        if rows:
+            total_rows = len(self.selected_files)
+            contiguous = rows[-1] - rows[0] + 1 == len(rows)
             
             # Enable/disable buttons based on position
-            self.move_up_btn.setEnabled(row > 0)
-            self.move_down_btn.setEnabled(row < total_rows - 1)
+            self.move_up_btn.setEnabled(rows[0] > 0 or not contiguous)
+            self.move_down_btn.setEnabled(rows[-1] < total_rows - 1 or not contiguous)
+            self.move_top_btn.setEnabled(rows[-1] >= len(rows))
+            self.move_bottom_btn.setEnabled(rows[0] < total_rows - len(rows))
+            self.move_to_btn.setEnabled(True)
+            self.move_position_spin.setMaximum(total_rows - len(rows) + 1)
         else:
             self.move_up_btn.setEnabled(False)
             self.move_down_btn.setEnabled(False)
+            self.move_top_btn.setEnabled(False)
+            self.move_bottom_btn.setEnabled(False)
+            self.move_to_btn.setEnabled(False)
         
         # Show file preview
         self.show_file_preview()
     
-    def move_file_up(self):
-        """Move the selected file up in the list."""
-        selected_items = self.preview_table.selectedItems()
-        if not selected_items:
+    def move_selected_files(self, rows, target):
+        """Move the given rows as one block so the first lands at position target."""
+        if not rows:
             return
         
-        current_row = selected_items[0].row()
-        if current_row <= 0:
+        # Keep what the splice may change, so a failed renumbering can be undone
+        start, stop = block_range(len(self.selected_files), rows, target)
+        sequence = self.sequence
+        lists = [self.selected_files, self.original_names]
+        if sequence is not None:
+            lists += [sequence.keys, sequence.positions]
+        saved = [items[start:stop] for items in lists]
+        
+        # Splice the parallel lists; only [start, stop) changes
+        start, stop = move_block(self.selected_files, rows, target)
+        if start == stop:
             return
+        move_block(self.original_names, rows, target)
+        if sequence is not None:
+            # Group numbers also change only inside [start, stop)
+            sequence.move(rows, target)
+        
+        # Renumber just the affected range; the filter index follows the move
+        # instead of being rebuilt
+        try:
+            new_names = self.generate_new_names(start, stop)
+        except (ValueError, PluginError) as e:
+            for items, window in zip(lists, saved):
+                items[start:stop] = window
+            self.sequence = sequence
+            QMessageBox.warning(self, "Cannot Generate Names", str(e))
+            return
+        self.new_names[start:stop] = new_names
+        keys = self.get_sequence().keys
+        if self.name_index is not None:
+            self.name_index.move(rows, target)
+            self.name_index.set_new_names(start, stop, self.new_names[start:stop])
+        if self.preview_model.columns[2] is keys:
+            self.preview_model.source_rows_changed(start, stop)
+        else:
+            self.preview_model.set_columns(self.original_names, self.new_names, keys)
+        self.apply_filter()
         
-        # Swap files in the selected_files list
-        self.selected_files[current_row], self.selected_files[current_row - 1] = \
-            self.selected_files[current_row - 1], self.selected_files[current_row]
-        
-        # Refresh the preview with updated order
-        self.preview_rename()
-        
-        # Re-select the moved item at its new position
-        self.preview_table.selectRow(current_row - 1)
+        # Re-select the moved block at its new position
+        first = max(0, min(target, len(self.selected_files) - len(rows)))
+        self.preview_table.select_source_rows(range(first, first + len(rows)), first)
+    
+    def move_file_up(self):
+        """Move the selected files up in the list."""
+        rows = self.preview_table.selected_rows()
+        if rows:
+            self.move_selected_files(rows, rows[0] - 1 if rows[0] > 0 else 0)
     
     def move_file_down(self):
-        """Move the selected file down in the list."""
-        selected_items = self.preview_table.selectedItems()
-        if not selected_items:
-            return
-        
-        current_row = selected_items[0].row()
-        if current_row >= self.preview_table.rowCount() - 1:
-            return
-        
-        # Swap files in the selected_files list
-        self.selected_files[current_row], self.selected_files[current_row + 1] = \
-            self.selected_files[current_row + 1], self.selected_files[current_row]
-        
-        # Refresh the preview with updated order
-        self.preview_rename()
-        
-        # Re-select the moved item at its new position
-        self.preview_table.selectRow(current_row + 1)
+        """Move the selected files down in the list."""
+        rows = self.preview_table.selected_rows()
+        if rows:
+            contiguous = rows[-1] - rows[0] + 1 == len(rows)
+            self.move_selected_files(rows, rows[0] + 1 if contiguous else rows[0])
+    
+    def move_files_to_top(self):
+        """Move the selected files to the top of the list."""
+        self.move_selected_files(self.preview_table.selected_rows(), 0)
+    
+    def move_files_to_bottom(self):
+        """Move the selected files to the bottom of the list."""
+        self.move_selected_files(self.preview_table.selected_rows(), len(self.selected_files))
+    
+    def move_files_to_position(self):
+        """Move the selected files so the first one lands at the chosen position."""
+        self.move_selected_files(self.preview_table.selected_rows(),
+                                 self.move_position_spin.value() - 1)
+    
+    def on_rows_dropped(self, rows, drop_row):
+        """Handle rows dragged and dropped inside the preview table."""
+        self.move_selected_files(rows, drop_target(rows, drop_row))
     
     def format_file_size(self, size_bytes):
         """Format file size in human-readable format."""
@@ -519,13 +1099,12 @@ class FileRenamerApp(QMainWindow):
     
     def open_selected_file(self):
         """Open the selected file in its default application."""
-        selected_items = self.preview_table.selectedItems()
-        if not selected_items:
+        if not self.preview_table.selectionModel().hasSelection():
             QMessageBox.warning(self, "No Selection", "Please select a file first.")
             return
         
-        row = selected_items[0].row()
-        if row >= len(self.selected_files):
+        row = self.preview_table.current_source_row()
+        if row < 0 or row >= len(self.selected_files):
             return
         
         file_path = Path(self.selected_files[row])
@@ -534,9 +1113,14 @@ class FileRenamerApp(QMainWindow):
         else:
             QMessageBox.warning(self, "File Not Found", f"The file {file_path.name} was not found.")
         
-    def generate_new_name(self, original_path, index):
-        """Generate new filename based on current settings."""
+    def generate_new_name(self, original_path, index, number=None):
+        """Generate new filename based on current settings.
+        
+        number is the sequence number as text; by default the start number plus index.
+        """
         file_path = Path(original_path)
+        if number is None:
+            number = str(self.start_number_spin.value() + index)
         extension = file_path.suffix
         
         # Get base name - if user enters anything (even spaces), use it; otherwise use original name
@@ -561,7 +1145,7 @@ class FileRenamerApp(QMainWindow):
             if self.include_time_check.isChecked():
                 new_name_parts.append(datetime.now().strftime("%H-%M-%S"))
             # Add index for uniqueness
-            new_name_parts.append(str(self.start_number_spin.value() + index))
+            new_name_parts.append(number)
         else:
             # Numeric mode
             if self.include_date_check.isChecked():
@@ -569,43 +1153,228 @@ class FileRenamerApp(QMainWindow):
             if self.include_time_check.isChecked():
                 new_name_parts.append(datetime.now().strftime("%H-%M-%S"))
             # Add sequential number
-            new_name_parts.append(str(self.start_number_spin.value() + index))
+            new_name_parts.append(number)
         
         # Build the new name - filter out empty parts
         new_name_parts = [part for part in new_name_parts if part]
         
         # If somehow all parts are empty, use just the number
         if not new_name_parts:
-            new_name_parts = [str(self.start_number_spin.value() + index)]
+            new_name_parts = [number]
         
         new_name = "_".join(new_name_parts) + extension
         return new_name
         
+    def create_sanitizer(self):
+        """Create a name sanitizer from the current settings, or None if disabled."""
+        if not self.sanitize_check.isChecked():
+            return None
+        normalization = self.normalization_combo.currentText()
+        return NameSanitizer(
+            replacement=self.replacement_input.text(),
+            normalization=None if normalization == "None" else normalization
+        )
+    
+    def create_template(self):
+        """Create the folder template from the current settings, or None if empty.
+        
+        Raises ValueError if the template is invalid.
+        """
+        text = self.template_input.text().strip()
+        return PathTemplate(text) if text else None
+    
+    def get_sequence(self):
+        """Return the (grouped) sequence numbers of the selection, computing them in one pass if needed."""
+        mode = self.group_combo.currentText()
+        sequence = self.sequence
+        if sequence is None or sequence.mode != mode or len(sequence) != len(self.selected_files):
+            keys = group_keys(self.selected_files, mode, self.stat_cache)
+            sequence = GroupedSequence(keys, mode)
+            self.sequence = sequence
+        return sequence
+    
+    def generate_new_names(self, start=0, stop=None):
+        """Generate new names for the selection (or rows start..stop), then sanitize them as a batch.
+        
+        With a folder template the names are relative paths using '/' between folders.
+        Raises ValueError if the template is invalid, or PluginError if a plugin fails.
+        """
+        if stop is None:
+            stop = len(self.selected_files)
+        
+        sequence = self.get_sequence()
+        start_number = self.start_number_spin.value()
+        
+        plugin = self.generator_combo.currentData()
+        if plugin is not None:
+            # Plugins get the whole range as one batch instead of one call per file
+            batch = NameBatch(self.selected_files[start:stop], range(start, stop),
+                              start_number=start_number,
+                              total=len(self.selected_files), stat_cache=self.stat_cache,
+                              numbers=[sequence.number(i, start_number) for i in range(start, stop)],
+                              groups=sequence.keys[start:stop])
+            new_names = run_plugin(load_plugin(plugin), batch)
+        else:
+            pad = self.pad_numbers_check.isChecked()
+            new_names = [self.generate_new_name(self.selected_files[i], i,
+                                                sequence.format(i, start_number, pad))
+                         for i in range(start, stop)]
+        sanitizer = self.create_sanitizer()
+        if sanitizer is not None:
+            new_names = sanitizer.sanitize_all(new_names)
+        
+        template = self.create_template()
+        if template is not None:
+            stats = [None] * len(new_names)
+            if template.needs_stat:
+                stats = self.stat_cache.stat_all(self.selected_files[start:stop])
+            new_names = [
+                template.render(self.selected_files[i], sequence.number(i, start_number), name, stat)
+                for i, name, stat in zip(range(start, stop), new_names, stats)
+            ]
+            if sanitizer is not None:
+                # Sanitize each folder level separately so '/' keeps separating them
+                new_names = ["/".join(sanitizer.sanitize_all(name.split("/"))) for name in new_names]
+        return new_names
+        
     def preview_rename(self):
         """Preview the renamed files in the table."""
         if not self.selected_files:
             QMessageBox.warning(self, "No Files", "Please select files first.")
             return
         
-        self.preview_table.setRowCount(len(self.selected_files))
+        # Regroup from scratch: the selection, settings or dates may have changed
+        self.sequence = None
+        try:
+            new_names = self.generate_new_names()
+        except (ValueError, PluginError) as e:
+            QMessageBox.warning(self, "Cannot Generate Names", str(e))
+            return
         
-        for i, file_path in enumerate(self.selected_files):
-            original_name = Path(file_path).name
-            new_name = self.generate_new_name(file_path, i)
-            
-            self.preview_table.setItem(i, 0, QTableWidgetItem(original_name))
-            self.preview_table.setItem(i, 1, QTableWidgetItem(new_name))
+        self.original_names = [Path(file_path).name for file_path in self.selected_files]
+        self.new_names = new_names
+        
+        self.preview_model.set_columns(self.original_names, self.new_names, self.sequence.keys)
+        self.preview_table.setColumnHidden(2, self.sequence.mode == GROUP_NONE)
+        
+        # Names changed, so the filter index is rebuilt and the filter re-applied
+        if self.name_index is not None:
+            self.name_index.close()
+        self.name_index = NameIndex(self.original_names, self.new_names)
+        self.apply_filter()
+    
+    def apply_filter(self):
+        """Show only the preview rows that match the filter box."""
+        self.filter_timer.stop()
+        if self.name_index is None:
+            return
+        total = len(self.name_index)
+        
+        try:
+            rows = self.name_index.search(
+                self.filter_input.text(),
+                self.filter_mode_combo.currentText(),
+                self.filter_column_combo.currentText()
+            )
+        except re.error:
+            self.filter_input.setStyleSheet("border: 2px solid #f44336;")
+            self.filter_status_label.setText("Invalid pattern")
+            return
+        self.filter_input.setStyleSheet("")
+        
+        if rows is None and not self.filter_input.text():
+            self.filter_status_label.setText("")
+        else:
+            # None also means every row matched
+            shown = total if rows is None else len(rows)
+            self.filter_status_label.setText(f"{shown} of {total}")
+        self.preview_table.set_rows(rows)
             
-    def check_duplicate_names(self):
-        """Check for duplicate names in the preview."""
-        new_names = set()
-        for i in range(self.preview_table.rowCount()):
-            new_name_item = self.preview_table.item(i, 1)
-            if new_name_item:
-                new_name = new_name_item.text()
-                if new_name in new_names:
-                    return True, new_name
-                new_names.add(new_name)
+    def build_rename_plan(self):
+        """Build the list of (source, target) paths for the current settings."""
+        destination = None
+        if self.transfer_mode_combo.currentText() != MODE_RENAME:
+            destination = Path(self.destination_input.text())
+        
+        plan = []
+        for original_path, new_name in zip(self.selected_files, self.generate_new_names()):
+            file_path = Path(original_path)
+            plan.append((file_path, (destination or file_path.parent) / new_name))
+        return plan
+    
+    def check_destination(self):
+        """Warn and return False if a copy/move mode has no usable destination folder."""
+        if self.transfer_mode_combo.currentText() == MODE_RENAME:
+            return True
+        destination = self.destination_input.text().strip()
+        if not destination or not Path(destination).is_dir():
+            QMessageBox.warning(self, "No Destination", "Please choose an existing destination folder.")
+            return False
+        return True
+    
+    def create_filesystem(self, mode):
+        """Return the filesystem backend and worker count for a transfer mode."""
+        if mode == MODE_RENAME:
+            # renameat2 on Linux: no-clobber in one syscall, atomic swaps
+            fs, workers = create_local_filesystem(), 1
+        else:
+            fs, workers = TransferFileSystem(mode, self.io_scheduler), TRANSFER_WORKERS
+        return ScheduledFileSystem(fs, self.io_scheduler), workers
+    
+    def simulate(self, plan, mode):
+        """Dry-run a plan the way run_plan will apply it; returns the issues found."""
+        swaps = find_swaps(plan) if mode == MODE_RENAME and HAVE_RENAMEAT2 else None
+        vfs = VirtualFileSystem(autoload=True, scheduler=self.io_scheduler)
+        return simulate_plan(plan, vfs, keep_sources=mode == MODE_COPY, swaps=swaps)
+    
+    def format_dry_run_issues(self, issues, limit=20):
+        """Format dry-run issues as a readable summary."""
+        lines = [f"#{issue.index + 1} {Path(issue.source).name} → {issue.message}"
+                 for issue in issues[:limit]]
+        if len(issues) > limit:
+            lines.append(f"... and {len(issues) - limit} more")
+        return "\n".join(lines)
+    
+    def dry_run(self):
+        """Simulate the rename plan in memory and report every problem found."""
+        if not self.selected_files:
+            QMessageBox.warning(self, "No Files", "Please select files first.")
+            return
+        if not self.check_destination():
+            return
+        
+        try:
+            plan = self.build_rename_plan()
+        except (ValueError, PluginError) as e:
+            QMessageBox.warning(self, "Cannot Generate Names", str(e))
+            return
+        
+        issues = self.simulate(plan, self.transfer_mode_combo.currentText())
+        if not issues:
+            QMessageBox.information(
+                self,
+                "Dry Run",
+                f"No problems found. All {len(self.selected_files)} file(s) can be renamed."
+            )
+        else:
+            QMessageBox.warning(
+                self,
+                "Dry Run",
+                f"Found {len(issues)} problem(s):\n\n{self.format_dry_run_issues(issues)}"
+            )
+    
+    def check_duplicate_names(self, plan):
+        """Check a rename plan for two files getting the same target path.
+        
+        Names only clash within one folder, so numbering restarted per folder
+        can reuse the same name in different folders.
+        """
+        targets = set()
+        for source, target in plan:
+            key = (target.parent, target.name)
+            if key in targets:
+                return True, target.name
+            targets.add(key)
         return False, None
         
     def rename_files(self):
@@ -614,8 +1383,18 @@ class FileRenamerApp(QMainWindow):
             QMessageBox.warning(self, "No Files", "Please select files first.")
             return
         
+        if not self.check_destination():
+            return
+        mode = self.transfer_mode_combo.currentText()
+        
+        try:
+            plan = self.build_rename_plan()
+        except (ValueError, PluginError) as e:
+            QMessageBox.warning(self, "Cannot Generate Names", str(e))
+            return
+        
         # Check for duplicates
-        has_duplicates, duplicate_name = self.check_duplicate_names()
+        has_duplicates, duplicate_name = self.check_duplicate_names(plan)
         if has_duplicates:
             QMessageBox.critical(
                 self,
@@ -625,64 +1404,187 @@ class FileRenamerApp(QMainWindow):
             )
             return
         
+        # Simulate the whole plan before anything touches disk
+        issues = self.simulate(plan, mode)
+        if issues:
+            reply = QMessageBox.question(
+                self,
+                "Dry Run Problems",
+                f"The dry run found {len(issues)} problem(s):\n\n"
+                f"{self.format_dry_run_issues(issues)}\n\n"
+                "Continue anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+        
         # Confirm action
         reply = QMessageBox.question(
             self,
             "Confirm Rename",
-            f"Are you sure you want to rename {len(self.selected_files)} file(s)?",
+            f"Are you sure you want to rename {len(self.selected_files)} file(s)?"
+            + ("" if mode == MODE_RENAME else f"\n\n{mode}: {self.destination_input.text()}"),
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.No:
             return
         
-        # Perform renaming
-        success_count = 0
-        error_count = 0
+        # Record the plan so an interrupted run can be resumed
+        checkpoint = Checkpoint()
+        if checkpoint.exists():
+            reply = QMessageBox.question(
+                self,
+                "Discard Interrupted Run",
+                "An interrupted rename can still be resumed with ⏯️ Resume.\n"
+                "Starting a new rename discards it. Continue?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+        try:
+            checkpoint.start(plan, {"mode": mode})
+        except OSError as e:
+            reply = QMessageBox.question(
+                self,
+                "Checkpoint Unavailable",
+                f"Cannot write the checkpoint:\n{str(e)}\n\n"
+                "Without it, an interrupted run cannot be resumed.\n"
+                "Continue without resume support?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+            checkpoint = None
         
-        for i, original_path in enumerate(self.selected_files):
+        self.run_plan(plan, checkpoint, mode=mode)
+    
+    def run_plan(self, plan, checkpoint, resume_point=None, mode=MODE_RENAME):
+        """Apply a plan with a cancellable progress dialog and show the results."""
+        fs, workers = self.create_filesystem(mode)
+        self.io_scheduler.reset_stats()
+        
+        # Create every target folder once up front instead of once per file;
+        # files whose folder cannot be created fail individually below
+        DirectoryCache(self.io_scheduler).ensure_all(target_directories(plan))
+        action = {MODE_RENAME: "Renaming", MODE_COPY: "Copying", MODE_MOVE: "Moving"}[mode]
+        progress_dialog = QProgressDialog(f"{action} files...", "Stop", 0, len(plan), self)
+        progress_dialog.setWindowTitle(action)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        started = time.monotonic()
+        
+        def report_progress(done, total):
+            progress_dialog.setValue(done)
+            label = f"{action} files... {done} of {total}"
+            bytes_done = getattr(fs, 'bytes_done', 0)
+            elapsed = time.monotonic() - started
+            if bytes_done and elapsed > 0:
+                label += (f"\n{self.format_file_size(bytes_done)} copied, "
+                          f"{self.format_file_size(bytes_done / elapsed)}/s")
+            if self.io_scheduler.limited:
+                label += f"\n{self.format_io_rates(self.io_scheduler.rates())}"
+            progress_dialog.setLabelText(label)
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+        
+        # Perform renaming - locked or busy files are retried with backoff
+        results = apply_plan(plan, fs, checkpoint=checkpoint, resume_point=resume_point,
+                             progress=report_progress, checkpoint_interval=0.5,
+                             workers=workers)
+        progress_dialog.close()
+        counts = count_results(results)
+        rate_summary = f"Achieved: {self.format_io_rates(self.io_scheduler.rates())}"
+        resumable = checkpoint is not None and checkpoint.error is None
+        
+        # A finished run no longer needs its checkpoint
+        if checkpoint is not None and not counts[STATUS_NOT_STARTED]:
             try:
-                file_path = Path(original_path)
-                new_name = self.generate_new_name(original_path, i)
-                new_path = file_path.parent / new_name
-                
-                # Check if target file already exists
-                if new_path.exists():
-                    error_count += 1
-                    continue
-                
-                file_path.rename(new_path)
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                print(f"Error renaming {original_path}: {str(e)}")
+                checkpoint.clear()
+            except OSError:
+                # Left behind, a finished run's checkpoint resumes with nothing to do
+                pass
+        self.resume_btn.setEnabled(Checkpoint().exists())
         
         # Show results
-        if error_count == 0:
+        if counts[STATUS_RENAMED] == len(results):
             QMessageBox.information(
                 self,
                 "Success",
-                f"Successfully renamed {success_count} file(s)!"
+                f"Successfully renamed {counts[STATUS_RENAMED]} file(s)!\n\n{rate_summary}"
             )
             self.reset_app()
         else:
-            QMessageBox.warning(
+            if checkpoint is not None and checkpoint.error is not None:
+                rate_summary += f"\nCheckpointing stopped during the run: {checkpoint.error}"
+            RenameResultsDialog(results, self, rate_summary, resumable).exec()
+    
+    def resume_rename(self):
+        """Continue an interrupted rename from its last checkpoint."""
+        checkpoint = Checkpoint()
+        try:
+            plan, resume_point = checkpoint.load()
+            validate_resume_point(plan, resume_point,
+                                  ScheduledFileSystem(LocalFileSystem(), self.io_scheduler))
+        except CheckpointError as e:
+            reply = QMessageBox.question(
                 self,
-                "Partial Success",
-                f"Renamed {success_count} file(s).\n"
-                f"Failed to rename {error_count} file(s)."
+                "Cannot Resume",
+                f"The saved rename cannot be resumed:\n{str(e)}\n\n"
+                "Discard the checkpoint?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
+            if reply == QMessageBox.StandardButton.Yes:
+                checkpoint.clear()
+                self.resume_btn.setEnabled(False)
+            return
+        
+        done = resume_point.next_index - len(resume_point.pending)
+        reply = QMessageBox.question(
+            self,
+            "Resume Rename",
+            f"An interrupted rename was found: {done} of {len(plan)} file(s) done.\n"
+            f"Continue with the remaining {len(plan) - done} file(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.No:
+            return
+        
+        self.run_plan(plan, checkpoint, resume_point,
+                      mode=checkpoint.options.get("mode", MODE_RENAME))
             
     def reset_app(self):
         """Reset the application to initial state."""
         self.selected_files = []
-        self.preview_table.setRowCount(0)
+        self.original_names = []
+        self.new_names = []
+        self.stat_cache = StatCache(self.io_scheduler)
+        self.file_index = FileIndex(self.stat_cache)
+        if self.name_index is not None:
+            self.name_index.close()
+        self.name_index = None
+        self.sequence = None
+        self.filter_input.clear()
+        self.filter_status_label.setText("")
+        self.preview_model.set_columns([], [], [])
         self.base_name_input.clear()
         self.start_number_spin.setValue(1)
+        self.group_combo.setCurrentIndex(0)
+        self.pad_numbers_check.setChecked(False)
         self.include_date_check.setChecked(False)
         self.include_time_check.setChecked(False)
         self.numeric_radio.setChecked(True)
+        self.sanitize_check.setChecked(True)
+        self.replacement_input.setText("_")
+        self.normalization_combo.setCurrentIndex(0)
+        self.generator_combo.setCurrentIndex(0)
+        self.template_input.clear()
+        self.transfer_mode_combo.setCurrentIndex(0)
+        self.destination_input.clear()
+        self.ops_limit_spin.setValue(0)
+        self.bytes_limit_spin.setValue(0)
+        self.mount_limit_spin.setValue(0)
+        self.low_priority_check.setChecked(False)
         self.file_info_label.setText("Select a file to preview")
         self.preview_text.clear()
         self.preview_image_label.clear()
@@ -0,0 +1,48 @@
+"""
+Shared stat pass for the Batch File Renamer app.
+Each selected file is stat'ed at most once per selection; every feature that
+needs sizes, dates or inode numbers reads from the same cache.
+"""
+
+import os
+
+
+class StatCache:
+    """Cache of os.stat results keyed by path.
+
+    With a scheduler (an IOScheduler) every stat call goes through its limits.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler
+        self._stats = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+    def stat(self, path):
+        """Return the stat result for path, or None if it cannot be stat'ed."""
+        path = os.fspath(path)
+        try:
+            return self._stats[path]
+        except KeyError:
+            pass
+        try:
+            if self.scheduler is None:
+                result = os.stat(path)
+            else:
+                with self.scheduler.operation(path):
+                    result = os.stat(path)
+        except OSError:
+            result = None
+        self._stats[path] = result
+        return result
+
+    def stat_all(self, paths):
+        """Return stat results for many paths, in order (None where stat failed)."""
+        stat = self.stat
+        return [stat(path) for path in paths]
+
+    def clear(self):
+        """Forget all cached results (for example after files were renamed)."""
+        self._stats.clear()
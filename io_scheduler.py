@@ -0,0 +1,242 @@
+"""
+I/O scheduling for the Batch File Renamer app.
+Every filesystem operation (stat, listing, mkdir, rename, copy) can be routed
+through one IOScheduler, which paces operations and bytes with token buckets,
+caps how many operations run at once on each mount, can drop the worker
+threads to idle I/O priority (like ionice -c3), and measures the rates
+actually achieved so the limits can be tuned against a storage SLA.
+"""
+
+import ctypes
+import os
+import platform
+import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+IORates = namedtuple("IORates", ["ops", "bytes", "elapsed", "ops_per_second", "bytes_per_second"])
+
+# ioprio_set(2) syscall numbers; the call has no wrapper in glibc
+_IOPRIO_SET = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314,
+               "armv6l": 314, "ppc64le": 273, "s390x": 282, "riscv64": 30}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_CLASS_IDLE = 3
+
+# Windows SetThreadPriority modes that also lower the thread's I/O priority
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+THREAD_MODE_BACKGROUND_END = 0x00020000
+
+
+class TokenBucket:
+    """Rate limiter allowing rate units per second with bursts of up to burst units.
+
+    A rate of 0 or None means unlimited. Requests larger than the bucket (such
+    as one big copy chunk) are allowed and simply make later callers wait
+    longer, so the long-run average never exceeds the rate. Thread-safe.
+    """
+
+    def __init__(self, rate=None, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        """Change the rate (and burst, default one tenth of a second's worth)."""
+        with self._lock:
+            self.rate = rate or 0
+            self.burst = burst if burst is not None else max(1.0, self.rate / 10.0)
+            self._tokens = self.burst
+            self._updated = self.clock()
+
+    def acquire(self, amount=1):
+        """Take amount tokens, sleeping until the rate allows it."""
+        if not self.rate:
+            return
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        # Sleep outside the lock; the tokens are already reserved for this caller
+        if wait > 0:
+            self.sleep(wait)
+
+
+def set_io_priority(low):
+    """Set the calling thread's I/O priority to idle (low=True) or back to normal.
+
+    Returns False where this is not supported.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            number = _IOPRIO_SET.get(platform.machine())
+            if number is None:
+                return False
+            libc = ctypes.CDLL(None, use_errno=True)
+            # who=0 is the calling thread; class NONE restores the default
+            priority = IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT if low else 0
+            return libc.syscall(number, IOPRIO_WHO_PROCESS, 0, priority) == 0
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            mode = THREAD_MODE_BACKGROUND_BEGIN if low else THREAD_MODE_BACKGROUND_END
+            return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), mode))
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+class IOScheduler:
+    """Gate that filesystem operations pass through.
+
+    ops_per_second and bytes_per_second limit the average rates (0 = no limit),
+    max_per_mount caps concurrent operations per filesystem (0 = no cap) and
+    low_priority runs the calling threads at idle I/O priority.
+    """
+
+    def __init__(self, ops_per_second=0, bytes_per_second=0, max_per_mount=0,
+                 low_priority=False, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.ops_bucket = TokenBucket(clock=clock, sleep=sleep)
+        self.bytes_bucket = TokenBucket(clock=clock, sleep=sleep)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._devices = {}
+        self.configure(ops_per_second, bytes_per_second, max_per_mount, low_priority)
+        self.reset_stats()
+
+    def configure(self, ops_per_second=0, bytes_per_second=0, max_per_mount=0,
+                  low_priority=False):
+        """Change the limits; takes effect for the next operation."""
+        self.ops_per_second = ops_per_second
+        self.bytes_per_second = bytes_per_second
+        self.max_per_mount = max_per_mount
+        self.low_priority = low_priority
+        self.ops_bucket.configure(ops_per_second)
+        self.bytes_bucket.configure(bytes_per_second)
+        with self._lock:
+            self._slots = {}
+
+    @property
+    def limited(self):
+        """True if any limit or the low priority mode is active."""
+        return bool(self.ops_per_second or self.bytes_per_second or self.max_per_mount
+                    or self.low_priority)
+
+    def reset_stats(self):
+        """Start measuring achieved rates from now."""
+        with self._lock:
+            self._ops = 0
+            self._bytes = 0
+            self._started = self.clock()
+
+    def rates(self):
+        """Return the IORates achieved since the last reset_stats()."""
+        with self._lock:
+            ops, nbytes = self._ops, self._bytes
+            elapsed = self.clock() - self._started
+        if elapsed <= 0:
+            return IORates(ops, nbytes, elapsed, 0.0, 0.0)
+        return IORates(ops, nbytes, elapsed, ops / elapsed, nbytes / elapsed)
+
+    @contextmanager
+    def operation(self, *paths):
+        """Context manager around one filesystem operation on the given paths."""
+        self._apply_priority()
+        self.ops_bucket.acquire()
+
+        slots = []
+        if self.max_per_mount:
+            # Sorted so two operations spanning the same mounts cannot deadlock
+            for device in sorted({self.device(path) for path in paths}, key=repr):
+                slot = self._slot(device)
+                slot.acquire()
+                slots.append(slot)
+        try:
+            yield
+        finally:
+            for slot in reversed(slots):
+                slot.release()
+            with self._lock:
+                self._ops += 1
+
+    def transfer(self, count):
+        """Account for count bytes read or written, sleeping if over the byte rate."""
+        with self._lock:
+            self._bytes += count
+        self.bytes_bucket.acquire(count)
+
+    def _apply_priority(self):
+        # Each thread switches its own priority, once per change of setting
+        local = self._local
+        if getattr(local, 'low_priority', False) != self.low_priority:
+            set_io_priority(self.low_priority)
+            local.low_priority = self.low_priority
+
+    def _slot(self, device):
+        with self._lock:
+            slot = self._slots.get(device)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_mount)
+                self._slots[device] = slot
+            return slot
+
+    def device(self, path):
+        """Return the device id of the filesystem holding path (cached per folder).
+
+        Folders that cannot be stat'ed are returned as their own path.
+        """
+        directory = os.path.dirname(os.path.abspath(os.fspath(path)))
+        device = self._devices.get(directory)
+        if device is None:
+            # Paced and counted like any other operation, but without taking a
+            # mount slot: this runs while operation() is choosing the slots
+            self.ops_bucket.acquire()
+            try:
+                device = os.stat(directory).st_dev
+            except OSError:
+                device = directory
+            with self._lock:
+                self._ops += 1
+            self._devices[directory] = device
+        return device
+
+
+class ScheduledFileSystem:
+    """Filesystem backend wrapper that routes every call through an IOScheduler."""
+
+    def __init__(self, fs, scheduler):
+        self.fs = fs
+        self.scheduler = scheduler
+        self.no_clobber = getattr(fs, 'no_clobber', False)
+        if hasattr(fs, 'exchange'):
+            self.exchange = self._exchange
+        if hasattr(fs, 'completed'):
+            self.completed = self._completed
+
+    def __getattr__(self, name):
+        # Pass through attributes such as bytes_done
+        return getattr(self.fs, name)
+
+    def exists(self, path):
+        """Return True if a file or folder with this path exists."""
+        with self.scheduler.operation(path):
+            return self.fs.exists(path)
+
+    def rename(self, source, target):
+        """Rename source to target through the scheduler."""
+        with self.scheduler.operation(source, target):
+            self.fs.rename(source, target)
+
+    def _exchange(self, first, second):
+        with self.scheduler.operation(first, second):
+            self.fs.exchange(first, second)
+
+    def _completed(self, source, target):
+        with self.scheduler.operation(source, target):
+            return self.fs.completed(source, target)
@@ -0,0 +1,350 @@
+"""
+Name index for filtering the preview list of the Batch File Renamer app.
+Keeps lowercase copies of the original and new names plus a trigram index, so
+each keystroke in the filter box can narrow hundreds of thousands of rows
+without touching the table.
+
+Names are indexed by a stable id (their row when the index was built); a
+reorder only updates the id <-> row mapping and the names that changed, so
+the trigram index survives moving rows around.
+"""
+
+import fnmatch
+import re
+import threading
+import time
+from bisect import bisect_right
+from itertools import accumulate, compress, repeat
+from operator import contains
+
+from reorder import move_block
+
+
+FILTER_MODES = ("Contains", "Glob", "Regex")
+FILTER_COLUMNS = ("Both", "Original", "New")
+
+# Rows indexed between two short pauses that let the UI thread run
+_BUILD_CHUNK = 2000
+
+# Results with more than one match per this many names are kept as byte masks
+_DENSE = 32
+
+
+def _trigrams(text):
+    """Return the set of 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _containing(ids, lower, needle):
+    """Return the ids whose lowercase name contains needle (the loop runs in C)."""
+    return list(compress(ids, map(contains, map(lower.__getitem__, ids), repeat(needle))))
+
+
+class _ColumnIndex:
+    """Lowercase names of one column, by id, with a joined string and a trigram index.
+
+    The joined string is used for scans (short queries, glob and regex); the
+    trigram index maps every 3-character substring to the sorted ids of the
+    names containing it, and is built in a background thread on first use.
+    Ids whose name changed since then are kept in dirty and always re-checked.
+
+    Searches return a list of ids, or a bytearray with a 1 for every matching
+    id when so many names match that listing them would cost more.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lower = list(map(str.lower, self.names))
+        self.dirty = set()
+        self.trigrams = None
+        self._blob = None
+        self._starts = None
+        self._builder = None
+        self._cancelled = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def update(self, name_id, name):
+        """Change the name of one id."""
+        if name == self.names[name_id]:
+            return
+        self.names[name_id] = name
+        self.lower[name_id] = name.lower()
+        self.dirty.add(name_id)
+
+    def start_trigram_build(self):
+        """Build the trigram index in the background (once)."""
+        if self._builder is None:
+            self._builder = threading.Thread(target=self._build_trigrams,
+                                             args=(list(self.lower),), daemon=True)
+            self._builder.start()
+
+    def cancel(self):
+        """Stop a background build that is no longer needed."""
+        self._cancelled = True
+
+    def _build_trigrams(self, lower):
+        postings = {}
+        get = postings.get
+        for chunk_start in range(0, len(lower), _BUILD_CHUNK):
+            if self._cancelled:
+                return
+            for name_id in range(chunk_start, min(chunk_start + _BUILD_CHUNK, len(lower))):
+                for trigram in _trigrams(lower[name_id]):
+                    ids = get(trigram)
+                    if ids is None:
+                        postings[trigram] = [name_id]
+                    else:
+                        ids.append(name_id)
+            # Give the GUI thread the interpreter between chunks
+            time.sleep(0)
+        self.trigrams = postings
+
+    def _joined(self):
+        if self._blob is None:
+            # Names cannot contain newlines on any supported filesystem, so '\n' is a safe separator
+            self._blob = "\n".join(self.lower)
+            # Offset of each name: running total of the lengths plus separators
+            self._starts = list(accumulate(map((1).__add__, map(len, self.lower)), initial=0))
+            self._starts.pop()
+        return self._blob, self._starts
+
+    def _with_dirty(self, ids, matches):
+        """Replace results for changed names (stale in the joined string) with fresh checks."""
+        if not self.dirty:
+            return ids
+        dirty = self.dirty
+        ids = [name_id for name_id in ids if name_id not in dirty]
+        ids.extend(name_id for name_id in dirty if matches(name_id))
+        return ids
+
+    def contains(self, needle):
+        """Return the ids (unsorted) or mask of the names containing needle, ignoring case."""
+        lower = self.lower
+        trigrams = self.trigrams
+        if trigrams is not None and len(needle) >= 3:
+            candidates = []
+            for trigram in _trigrams(needle):
+                ids = trigrams.get(trigram)
+                if ids is None:
+                    candidates = []
+                    break
+                if not candidates or len(ids) < len(candidates):
+                    candidates = ids
+            if len(candidates) * _DENSE > len(lower):
+                return self.scan(needle)
+            # Only the rarest trigram's ids need checking
+            ids = _containing(candidates, lower, needle)
+        else:
+            ids = self.find_all(needle)
+            if isinstance(ids, bytearray):
+                return ids
+        return self._with_dirty(ids, lambda name_id: needle in lower[name_id])
+
+    def scan(self, needle):
+        """Return the mask of the names containing needle, checking every name."""
+        return bytearray(map(contains, self.lower, repeat(needle)))
+
+    def find_all(self, needle):
+        """Return the ids containing needle, using str.find over the joined names."""
+        blob, starts = self._joined()
+        blob_find = blob.find
+        total = len(self.lower)
+        ids = []
+        position = blob_find(needle)
+        while position != -1:
+            name_id = bisect_right(starts, position) - 1
+            ids.append(name_id)
+            # Seeking costs about as much per hit as scanning _DENSE names, so
+            # once hits are that dense a plain scan is cheaper
+            if len(ids) % 256 == 0 and len(ids) * _DENSE > name_id:
+                return self.scan(needle)
+            if name_id + 1 >= total:
+                break
+            position = blob_find(needle, starts[name_id + 1])
+        return ids
+
+    def search_all(self, pattern, verify):
+        """Return the ids where verify(name) is true, seeking with pattern over the joined names.
+
+        pattern is compiled with re.MULTILINE so '^' and '$' anchor at name
+        boundaries; every candidate is confirmed with verify on its own name.
+        """
+        blob, starts = self._joined()
+        names = self.names
+        total = len(names)
+        blob_search = pattern.search
+        ids = []
+        name_id = 0
+        while name_id < total:
+            found = blob_search(blob, starts[name_id])
+            if found is None:
+                break
+            name_id = bisect_right(starts, found.start()) - 1
+            if verify(names[name_id]):
+                ids.append(name_id)
+                if len(ids) % 256 == 0 and len(ids) * _DENSE > name_id:
+                    return bytearray(map(bool, map(verify, names)))
+            name_id += 1
+        return self._with_dirty(ids, lambda name_id: verify(names[name_id]))
+
+    def search_each(self, verify):
+        """Return the mask of the names where verify(name) is true, checking every name."""
+        return bytearray(map(bool, map(verify, self.names)))
+
+
+# \A, \Z and flags switched off inline, as in (?-m) or (?i-m:...), make a
+# pattern behave differently on the joined names than on each name
+_WHOLE_STRING = re.compile(r"\\[AZ]|\(\?[a-zA-Z]*-")
+
+
+# A glob bracket expression such as [abc], [!a-z] or []x]
+_GLOB_BRACKET = re.compile(r"\[!?\]?[^\]]*\]")
+
+
+def _glob_literal(query):
+    """Return the longest run of plain characters in a glob pattern.
+
+    Bracket expressions only match one of their characters, so they are
+    removed first and never count as part of the literal.
+    """
+    return max(re.split(r"[*?\[\]]", _GLOB_BRACKET.sub("*", query)), key=len)
+
+
+class NameIndex:
+    """Index over the original and new names shown in the preview table.
+
+    Row numbers returned by search() are positions in the selection, so filtering
+    never changes the order used for numbering. After rows are reordered, call
+    move() and set_new_names() instead of building a new index.
+    """
+
+    def __init__(self, original_names, new_names):
+        self._raw = {"Original": list(original_names), "New": list(new_names)}
+        self._columns = {}
+        self._id_at = list(range(len(original_names)))
+        self._row_of = list(range(len(original_names)))
+        self._moved = False
+        self._last_query = None
+        self._last_ids = None
+
+    def __len__(self):
+        return len(self._id_at)
+
+    def _column(self, name):
+        index = self._columns.get(name)
+        if index is None:
+            # Built on first use, so a preview refresh costs nothing until someone filters
+            index = _ColumnIndex(self._raw[name])
+            self._columns[name] = index
+        return index
+
+    def move(self, rows, target):
+        """Mirror a move_block reorder of the preview rows; returns (start, stop)."""
+        start, stop = move_block(self._id_at, rows, target)
+        for row in range(start, stop):
+            self._row_of[self._id_at[row]] = row
+        self._moved = self._moved or start < stop
+        return start, stop
+
+    def set_new_names(self, start, stop, names):
+        """Update the new names of rows start..stop after they were regenerated."""
+        self._last_query = None
+        raw = self._raw["New"]
+        column = self._columns.get("New")
+        for row, name in zip(range(start, stop), names):
+            name_id = self._id_at[row]
+            raw[name_id] = name
+            if column is not None:
+                column.update(name_id, name)
+
+    def close(self):
+        """Stop background work; call when the index is replaced."""
+        for column in self._columns.values():
+            column.cancel()
+
+    def _rows(self, found):
+        """Turn the results of the searched columns into sorted, unique rows.
+
+        Returns None if every row matched.
+        """
+        row_of = self._row_of
+        total = len(self)
+        masks = [result for result in found if isinstance(result, bytearray)]
+        if not masks:
+            return sorted({row_of[name_id] for ids in found for name_id in ids})
+
+        if len(masks) == 1:
+            mask = masks[0]
+        else:
+            # OR the two masks as big integers, which runs in C
+            first, second = (int.from_bytes(mask, "little") for mask in masks)
+            mask = bytearray((first | second).to_bytes(total, "little"))
+        for ids in found:
+            if not isinstance(ids, bytearray):
+                for name_id in ids:
+                    mask[name_id] = 1
+        if mask.count(1) == total:
+            return None
+        selected = map(mask.__getitem__, self._id_at) if self._moved else mask
+        return list(compress(range(total), selected))
+
+    def search(self, query, mode="Contains", column="Both"):
+        """Return the sorted rows matching query, or None if every row matches.
+
+        Raises re.error for an invalid regular expression.
+        """
+        if not query:
+            return None
+
+        # Trigram indexes start building with the second search, so the
+        # background thread never slows the first answer
+        for index in self._columns.values():
+            index.start_trigram_build()
+        columns = ("Original", "New") if column == "Both" else (column,)
+
+        if mode == "Contains":
+            needle = query.lower()
+            last = self._last_query
+            # A query containing the previous one can only narrow the result,
+            # so when that result is small only its ids need re-checking
+            if last and last[0] == mode and last[2] == column and last[1] in needle \
+                    and self._last_ids is not None:
+                found = [_containing(self._last_ids, self._column(name).lower, needle)
+                         for name in columns]
+            else:
+                found = [self._column(name).contains(needle) for name in columns]
+            rows = self._rows(found)
+            self._last_query = (mode, needle, column)
+            small = rows is not None and len(rows) * 8 < len(self)
+            self._last_ids = list(map(self._id_at.__getitem__, rows)) if small else None
+            return rows
+
+        self._last_query = None
+        found = []
+        if mode == "Glob":
+            verify = re.compile(fnmatch.translate(query), re.IGNORECASE).match
+            literal = _glob_literal(query).lower()
+            for name in columns:
+                index = self._column(name)
+                names = index.names
+                candidates = index.contains(literal) if literal else None
+                if isinstance(candidates, list):
+                    found.append(list(compress(candidates,
+                                               map(verify, map(names.__getitem__, candidates)))))
+                else:
+                    # Too many candidates to list: check every name
+                    found.append(bytearray(map(bool, map(verify, names))))
+        else:
+            verify = re.compile(query, re.IGNORECASE).search
+            pattern = re.compile(query, re.IGNORECASE | re.MULTILINE)
+            whole_string = _WHOLE_STRING.search(query) is not None
+            for name in columns:
+                index = self._column(name)
+                if whole_string:
+                    # Those anchors would only match at the ends of the joined names
+                    found.append(index.search_each(verify))
+                else:
+                    found.append(index.search_all(pattern, verify))
+        return self._rows(found)
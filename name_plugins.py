@@ -0,0 +1,152 @@
+"""
+Plugin API for custom name generators in the Batch File Renamer app.
+
+A plugin is a .py file in one of the plugin folders that defines
+
+    NAME = "My scheme"                 # optional, shown in the UI
+    DESCRIPTION = "What it does"       # optional, used as tooltip
+
+    def generate(batch):
+        return [...]                   # one new name per file in the batch
+
+generate() receives a NameBatch describing the whole batch at once (paths,
+names, indices, numbers and lazily stat'ed size/date columns) and returns a
+list - or any sequence, such as a NumPy array - of new names in the same
+order. Extensions are not added automatically. After a reorder only the
+affected rows are regenerated, so a batch may be a slice of the selection;
+batch.total is the size of the whole selection.
+
+Plugin folders are only listed at startup; a plugin module is imported the
+first time it is used, so installed plugins do not slow down launching the app.
+"""
+
+import importlib.util
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from file_stats import StatCache
+
+
+PLUGIN_DIRS = [
+    # Next to the app (or the executable when packaged with PyInstaller)
+    Path(sys.executable if getattr(sys, 'frozen', False) else __file__).resolve().parent / "plugins",
+    Path.home() / ".batch_file_renamer" / "plugins",
+]
+
+PluginInfo = namedtuple("PluginInfo", ["name", "path"])
+
+
+class PluginError(Exception):
+    """Raised when a plugin cannot be loaded or returns unusable names."""
+
+
+class NameBatch:
+    """A batch of files handed to a plugin, as parallel columns.
+
+    paths, names, stems, extensions, indices (positions in the selection),
+    numbers (start_number + index, or the per-group numbers when numbering
+    restarts per folder/extension/date) and groups are plain lists computed
+    up front. sizes and mtimes come from the shared stat pass and are only
+    computed the first time a plugin reads them.
+    """
+
+    def __init__(self, paths, indices, start_number=1, total=None, stat_cache=None, stats=None,
+                 numbers=None, groups=None):
+        self.paths = [os.fspath(path) for path in paths]
+        self.indices = list(indices)
+        self.total = len(self.paths) if total is None else total
+        self.start_number = start_number
+        if numbers is None:
+            numbers = [start_number + index for index in self.indices]
+        self.numbers = list(numbers)
+        self.groups = [""] * len(self.paths) if groups is None else list(groups)
+        self.names = [os.path.basename(path) for path in self.paths]
+        self.stems = []
+        self.extensions = []
+        for name in self.names:
+            stem, extension = os.path.splitext(name)
+            self.stems.append(stem)
+            self.extensions.append(extension)
+        self._stat_cache = stat_cache
+        self._stats = stats
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def stats(self):
+        """os.stat results for every file (None where stat failed)."""
+        if self._stats is None:
+            if self._stat_cache is None:
+                self._stat_cache = StatCache()
+            self._stats = self._stat_cache.stat_all(self.paths)
+        return self._stats
+
+    @property
+    def sizes(self):
+        """File sizes in bytes (-1 where unknown)."""
+        return [stat.st_size if stat is not None else -1 for stat in self.stats]
+
+    @property
+    def mtimes(self):
+        """Modification times as POSIX timestamps (0.0 where unknown)."""
+        return [stat.st_mtime if stat is not None else 0.0 for stat in self.stats]
+
+
+def discover_plugins(plugin_dirs=None):
+    """List the available plugins without importing them."""
+    plugins = {}
+    for directory in (PLUGIN_DIRS if plugin_dirs is None else plugin_dirs):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.py') and not entry.name.startswith('_') \
+                            and entry.is_file():
+                        name = entry.name[:-3]
+                        # Earlier folders take precedence over later ones
+                        plugins.setdefault(name, PluginInfo(name, entry.path))
+        except OSError:
+            continue
+    return sorted(plugins.values())
+
+
+_loaded = {}
+
+
+def load_plugin(info):
+    """Import a plugin module (once) and return it."""
+    module = _loaded.get(info.path)
+    if module is not None:
+        return module
+
+    module_name = f"batch_renamer_plugin_{info.name}"
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, info.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception as e:
+        raise PluginError(f"Cannot load plugin {info.name}: {e}")
+
+    if not callable(getattr(module, 'generate', None)):
+        raise PluginError(f"Plugin {info.name} does not define generate(batch)")
+    _loaded[info.path] = module
+    return module
+
+
+def run_plugin(module, batch):
+    """Call a plugin's generate() and return its names as a list of str."""
+    try:
+        result = module.generate(batch)
+    except Exception as e:
+        raise PluginError(f"Plugin failed: {e}")
+
+    try:
+        names = [str(name) for name in result]
+    except TypeError:
+        raise PluginError("Plugin must return a sequence of names")
+
+    if len(names) != len(batch):
+        raise PluginError(f"Plugin returned {len(names)} names for {len(batch)} files")
+    return names
@@ -0,0 +1,145 @@
+"""
+Path templates for the Batch File Renamer app.
+Turns a template such as "{date:%Y}/{date:%m}/{stem}_{n}{ext}" into a relative
+target path per file, so a rename can also sort files into subfolders, and
+creates every needed folder once before the files are moved.
+"""
+
+import os
+import string
+from datetime import datetime
+from pathlib import Path
+
+
+# Fields available in a template, with a short description for the UI
+TEMPLATE_FIELDS = {
+    "name": "new name from the current settings",
+    "stem": "original name without extension",
+    "ext": "original extension, with the dot",
+    "extension": "original extension, lowercase, without the dot",
+    "n": "sequence number",
+    "date": "modification date (use a format, e.g. {date:%Y-%m})",
+    "size": "file size in bytes",
+    "parent": "name of the original folder",
+}
+
+# Fields that need the file to be stat'ed
+STAT_FIELDS = {"date", "size"}
+
+
+class PathTemplate:
+    """A parsed path template.
+
+    Raises ValueError for malformed templates or unknown fields.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.fields = set()
+        try:
+            for _, field_name, _, _ in string.Formatter().parse(template):
+                if field_name is None:
+                    continue
+                base = field_name.split('.')[0].split('[')[0]
+                if base not in TEMPLATE_FIELDS:
+                    raise ValueError(f"Unknown template field: {{{field_name}}}")
+                if field_name != base:
+                    raise ValueError(f"Template fields cannot use '.' or '[...]': {{{field_name}}}")
+                self.fields.add(base)
+        except ValueError as e:
+            raise ValueError(f"Invalid template: {e}")
+
+    @property
+    def needs_stat(self):
+        """True if rendering needs the file's stat result."""
+        return not self.fields.isdisjoint(STAT_FIELDS)
+
+    def render(self, file_path, number, new_name, stat_result=None):
+        """Return the relative target path (using '/' separators) for one file."""
+        file_path = Path(file_path)
+        values = {
+            "name": new_name,
+            "stem": file_path.stem,
+            "ext": file_path.suffix,
+            "extension": file_path.suffix[1:].lower(),
+            "n": number,
+            "parent": file_path.parent.name,
+        }
+        if stat_result is not None:
+            values["date"] = datetime.fromtimestamp(stat_result.st_mtime)
+            values["size"] = stat_result.st_size
+        elif self.needs_stat:
+            raise ValueError(f"Cannot read date/size of {file_path.name}")
+        try:
+            rendered = self.template.format(**values)
+        except (ValueError, TypeError) as e:
+            # Such as a format spec that does not suit the field, e.g. {n:%Y}
+            raise ValueError(f"Invalid template: {e}")
+        return safe_relative_path(rendered)
+
+
+def safe_relative_path(path):
+    """Normalize a rendered template to '/'-separated parts that stay inside the output folder."""
+    parts = []
+    for part in path.replace('\\', '/').split('/'):
+        if part in ('', '.'):
+            continue
+        parts.append('_' if part == '..' else part)
+    return '/'.join(parts)
+
+
+class DirectoryCache:
+    """Creates target folders, issuing at most one mkdir per folder.
+
+    Folders created (or found to exist) are remembered, so a batch that writes
+    into thousands of folders never asks the filesystem about the same one twice.
+    With a scheduler (an IOScheduler) every mkdir goes through its limits.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler
+        self._known = set()
+
+    def ensure(self, directory):
+        """Make sure directory exists, creating missing parents first."""
+        directory = os.path.normpath(os.fspath(directory))
+
+        # Walk up to the nearest folder already known, collecting the ones to create
+        missing = []
+        while directory not in self._known:
+            missing.append(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+        for folder in reversed(missing):
+            try:
+                if self.scheduler is None:
+                    os.mkdir(folder)
+                else:
+                    with self.scheduler.operation(folder):
+                        os.mkdir(folder)
+            except FileExistsError:
+                pass
+            except OSError:
+                # Some systems refuse mkdir on existing roots or read-only parents
+                if not os.path.isdir(folder):
+                    raise
+            self._known.add(folder)
+
+    def ensure_all(self, directories):
+        """Create every folder in directories; returns {folder: error} for failures."""
+        errors = {}
+        for directory in sorted(set(os.fspath(d) for d in directories)):
+            try:
+                self.ensure(directory)
+            except OSError as e:
+                errors[directory] = e
+        return errors
+
+
+def target_directories(plan):
+    """Return the target folders of a plan that differ from their source folder."""
+    return {os.path.dirname(os.fspath(target)) for source, target in plan
+            if os.path.dirname(os.fspath(source)) != os.path.dirname(os.fspath(target))}
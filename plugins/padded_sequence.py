@@ -0,0 +1,15 @@
+"""
+Example name generator plugin for the Batch File Renamer app.
+Numbers files with zero-padding sized to the whole selection, so names sort
+correctly everywhere (photo_0001.jpg ... photo_1500.jpg).
+"""
+
+NAME = "Padded sequence"
+DESCRIPTION = "Original name followed by a zero-padded number sized to the selection"
+
+
+def generate(batch):
+    """Return one new name per file in the batch."""
+    width = len(str(batch.start_number + batch.total - 1))
+    return [f"{stem}_{number:0{width}d}{extension}"
+            for stem, number, extension in zip(batch.stems, batch.numbers, batch.extensions)]
@@ -0,0 +1,413 @@
+"""
+Rename engine for the Batch File Renamer app.
+Applies a rename plan through a filesystem backend, so the same loop can run
+against the real disk or against the in-memory VirtualFileSystem from dry_run.
+Transient failures (locked or busy files) are retried with exponential backoff
+while the rest of the batch keeps going.
+"""
+
+import errno
+import heapq
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from checkpoint import ResumePoint
+
+
+# Outcome of one plan entry
+STATUS_RENAMED = "Renamed"
+STATUS_SKIPPED = "Skipped"
+STATUS_FAILED = "Failed"
+STATUS_NOT_STARTED = "Not started"
+
+RenameResult = namedtuple("RenameResult",
+                          ["index", "source", "target", "status", "attempts", "message"])
+
+# errno values that usually clear up on their own (locks, sync clients, network blips)
+TRANSIENT_ERRNOS = {
+    getattr(errno, name) for name in (
+        "EBUSY", "EAGAIN", "EWOULDBLOCK", "EINTR", "ETXTBSY", "ETIMEDOUT",
+        "ECONNRESET", "ECONNABORTED", "EHOSTDOWN", "EHOSTUNREACH", "ENETDOWN",
+        "ENETRESET", "ENETUNREACH", "ESTALE",
+    ) if hasattr(errno, name)
+}
+
+# Windows error codes: sharing/lock violations, access denied (antivirus scans)
+# and lost network connections
+TRANSIENT_WINERRORS = {5, 32, 33, 53, 59, 64, 121, 1231}
+
+# Longest time progress goes uncalled while apply_plan waits, so a GUI
+# calling it stays responsive and its Stop button works
+POLL_INTERVAL = 0.1
+
+
+def is_transient_error(error):
+    """Return True if an OSError is likely to succeed when retried."""
+    if not isinstance(error, OSError):
+        return False
+    winerror = getattr(error, 'winerror', None)
+    if winerror is not None:
+        return winerror in TRANSIENT_WINERRORS
+    return error.errno in TRANSIENT_ERRNOS
+
+
+class LocalFileSystem:
+    """Filesystem backend that operates on the real disk.
+
+    Backends whose rename() itself raises FileExistsError instead of
+    overwriting set no_clobber = True, and apply_plan then skips the separate
+    exists() check. Backends with an exchange(first, second) method can swap
+    two names in one step, and backends with a completed(source, target)
+    method decide when resuming whether an item finished before the
+    interruption (by default: its source is gone).
+    """
+
+    no_clobber = False
+
+    def exists(self, path):
+        """Return True if a file or folder with this path exists."""
+        return os.path.lexists(path)
+
+    def rename(self, source, target):
+        """Rename source to target."""
+        os.rename(source, target)
+
+
+class RetryQueue:
+    """Deferred items ordered by the time they may be retried.
+
+    The delay doubles with every attempt (base_delay, 2*base_delay, ...) up to
+    max_delay.
+    """
+
+    def __init__(self, base_delay=0.1, max_delay=5.0, clock=time.monotonic):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._heap = []
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, item, attempts):
+        """Schedule an item that has failed attempts times."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        self._counter += 1
+        heapq.heappush(self._heap, (self.clock() + delay, self._counter, item))
+
+    def pop_ready(self):
+        """Return the next item whose delay has passed, or None."""
+        if self._heap and self._heap[0][0] <= self.clock():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def items(self):
+        """Return the items still waiting, in no particular order."""
+        return [entry[2] for entry in self._heap]
+
+    def time_until_ready(self):
+        """Return the seconds until the next item is due (0 if one is due now)."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self.clock())
+
+
+def find_swaps(plan):
+    """Find pairs of plan entries that swap two names (a -> b and later b -> a).
+
+    Returns {first_index: second_index}.
+    """
+    by_pair = {}
+    for index, (source, target) in enumerate(plan):
+        by_pair.setdefault((os.fspath(source), os.fspath(target)), index)
+
+    swaps = {}
+    partners = set()
+    for index, (source, target) in enumerate(plan):
+        if index in partners:
+            continue
+        other = by_pair.get((os.fspath(target), os.fspath(source)))
+        if other is not None and other > index and other not in partners:
+            swaps[index] = other
+            partners.add(other)
+    return swaps
+
+
+def apply_plan(plan, fs=None, max_attempts=5, base_delay=0.1, max_delay=5.0,
+               clock=time.monotonic, sleep=time.sleep, checkpoint=None,
+               resume_point=None, progress=None, checkpoint_every=1000,
+               checkpoint_interval=2.0, workers=1):
+    """Apply a sequence of (source, target) renames in order.
+
+    Returns a list of RenameResult, one per plan entry and in plan order.
+    Targets that already exist are skipped rather than overwritten. Items that
+    fail with a transient error are moved to a retry queue and tried again,
+    up to max_attempts times in total, between and after the remaining items.
+
+    Every checkpoint_every items or checkpoint_interval seconds, the current
+    ResumePoint is recorded on checkpoint (if given) and progress(done, total)
+    is called. If recording fails with OSError, the run carries on without
+    checkpoints: the checkpoint is cleared and the error stored in its error
+    attribute. If progress returns False the run stops and the items not yet
+    tried are reported as not started. Passing a resume_point continues an
+    earlier run without touching the items it had already completed.
+
+    With workers > 1 the filesystem calls run on a thread pool (the backend
+    must be thread-safe), with at most two items per worker in flight.
+
+    When running sequentially on a backend with exchange(), pairs of entries
+    that swap two names are done together in one exchange, and each finished
+    swap is journaled on the checkpoint so a resumed run never swaps them back.
+    """
+    if fs is None:
+        fs = LocalFileSystem()
+
+    plan = list(plan)
+    total = len(plan)
+    no_clobber = getattr(fs, 'no_clobber', False)
+    completed = getattr(fs, 'completed', None)
+    if completed is None:
+        completed = lambda source, target: not fs.exists(source)
+    swaps = find_swaps(plan) if workers <= 1 and hasattr(fs, 'exchange') else {}
+    # Second entry of each swap -> first entry, which does the work for both
+    partners = {second: first for first, second in swaps.items()}
+    results = [None] * total
+    attempts = [0] * total
+    problems = {}
+    retry_queue = RetryQueue(base_delay, max_delay, clock)
+
+    start = 0
+    resuming = resume_point is not None
+    if resuming:
+        start = resume_point.next_index
+        problems.update(resume_point.problems)
+        for index in range(start):
+            if index in partners:
+                continue
+            if index in problems:
+                status, message = problems[index]
+                results[index] = RenameResult(index, *plan[index], status, 0, message)
+            elif index not in resume_point.pending:
+                results[index] = RenameResult(index, *plan[index], STATUS_RENAMED, 0,
+                                              "Renamed before resuming")
+        for index in resume_point.pending:
+            retry_queue.push(index, 1)
+
+    def perform(index):
+        """Do the filesystem work for one item; returns (status, message, error)."""
+        source, target = plan[index]
+        try:
+            if index in swaps:
+                if resuming and index in resume_point.swapped:
+                    return STATUS_RENAMED, "Swapped before resuming", None
+                fs.exchange(source, target)
+                return STATUS_RENAMED, f"Swapped with item {swaps[index] + 1}", None
+
+            # Check if target file already exists (no_clobber backends refuse atomically)
+            if no_clobber or not fs.exists(target):
+                try:
+                    fs.rename(source, target)
+                    return STATUS_RENAMED, "", None
+                except FileExistsError:
+                    pass
+                except FileNotFoundError:
+                    # no_clobber backends skip the exists() probe, so a source
+                    # already renamed before the interruption shows up here
+                    if resuming and fs.exists(target):
+                        return STATUS_RENAMED, "Renamed before resuming", None
+                    raise
+
+            if resuming and completed(source, target):
+                # Done after the last checkpoint but before the interruption
+                return STATUS_RENAMED, "Renamed before resuming", None
+            return STATUS_SKIPPED, "Target already exists", None
+
+        except Exception as e:
+            return STATUS_FAILED, str(e), e
+
+    def save(point=None, swap=None):
+        """Record point (or one finished swap) on the checkpoint.
+
+        On a write error the run carries on without a checkpoint.
+        """
+        nonlocal checkpoint
+        if checkpoint is None:
+            return
+        try:
+            if swap is not None:
+                checkpoint.record_swap(swap)
+            else:
+                checkpoint.record(point)
+        except OSError as e:
+            # A full disk or a dropped share must not abort the renames. The
+            # checkpoint on disk is now stale - resuming from it could replay
+            # swaps - so it is removed and the error left on it for the caller.
+            checkpoint.error = e
+            try:
+                checkpoint.clear()
+            except OSError:
+                pass
+            checkpoint = None
+
+    def record(index, outcome):
+        """Store the outcome of one attempt, or defer the item for a retry."""
+        status, message, error = outcome
+        attempts[index] += 1
+        if error is not None and is_transient_error(error) and attempts[index] < max_attempts:
+            retry_queue.push(index, attempts[index])
+            return
+        results[index] = RenameResult(index, *plan[index], status, attempts[index], message)
+        if status != STATUS_RENAMED:
+            problems[index] = (status, message)
+        if index in swaps and status == STATUS_RENAMED:
+            # An exchange must never be replayed: that would swap the names back.
+            # The journal entry is cheap; the next progress record covers it.
+            save(swap=index)
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight = {}
+
+    def collect(timeout):
+        """Record finished parallel items, waiting up to timeout (None = until one is done)."""
+        done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            record(in_flight.pop(future), future.result())
+
+    def dispatch(index):
+        """Run or submit one item; returns False, without starting it, if asked to stop."""
+        if executor is None:
+            record(index, perform(index))
+            return True
+        # Bounded window: never queue more than two items per worker. Long
+        # transfers can keep it full for minutes, so keep reporting meanwhile.
+        while len(in_flight) >= workers * 2:
+            collect(POLL_INTERVAL)
+            if not keep_alive(position):
+                return False
+        in_flight[executor.submit(perform, index)] = index
+        collect(0)
+        return True
+
+    def run_due_retries():
+        """Dispatch the retries that are due; returns False if asked to stop."""
+        ready = retry_queue.pop_ready()
+        while ready is not None:
+            if not dispatch(ready):
+                # Not started, so it is still waiting for its retry
+                retry_queue.push(ready, attempts[ready])
+                return False
+            ready = retry_queue.pop_ready()
+        return True
+
+    last_report = last_poll = clock()
+
+    def poll(next_index):
+        """Report progress without recording a checkpoint; return False to stop."""
+        nonlocal last_poll
+        last_poll = clock()
+        if progress is not None:
+            unfinished = len(retry_queue) + len(in_flight)
+            return progress(next_index - unfinished, total) is not False
+        return True
+
+    def report(next_index):
+        """Record a checkpoint and report progress; return False to stop."""
+        nonlocal last_report
+        last_report = clock()
+        if checkpoint is not None:
+            # Items still in flight are redone on resume, so resume from the oldest
+            frontier = min(in_flight.values(), default=next_index)
+            pending = [index for index in retry_queue.items() if index < frontier]
+            save(ResumePoint(frontier, pending, problems))
+        return poll(next_index)
+
+    def keep_alive(next_index):
+        """Keep the caller informed while waiting; returns False to stop.
+
+        Records a checkpoint every checkpoint_interval and reports progress
+        every POLL_INTERVAL.
+        """
+        now = clock()
+        if now - last_report >= checkpoint_interval:
+            return report(next_index)
+        if now - last_poll >= POLL_INTERVAL:
+            return poll(next_index)
+        return True
+
+    stopped_at = None
+    # Index of the next item the main pass will dispatch
+    position = start
+    try:
+        for index in range(start, total):
+            if index in partners:
+                # Done together with the first entry of its swap
+                continue
+            position = index
+            if not dispatch(index):
+                stopped_at = index
+                break
+            position = index + 1
+            # Retries that have come due are interleaved without slowing the main pass
+            if not run_due_retries():
+                stopped_at = index + 1
+                break
+            if (index + 1 - start) % checkpoint_every == 0 or \
+                    clock() - last_report >= checkpoint_interval:
+                if not report(index + 1):
+                    stopped_at = index + 1
+                    break
+
+        if stopped_at is None:
+            position = total
+            # Drain whatever is still in flight or waiting for its backoff to expire
+            while retry_queue or in_flight:
+                # Wait in short slices so progress keeps being called during backoffs
+                delay = retry_queue.time_until_ready()
+                delay = POLL_INTERVAL if delay is None else min(delay, POLL_INTERVAL)
+                if in_flight:
+                    collect(delay)
+                else:
+                    sleep(delay)
+                if not run_due_retries() or not keep_alive(total):
+                    stopped_at = total
+                    break
+
+        # Let transfers already started finish before reporting; the run is
+        # already stopping, so only the progress display is kept up to date
+        while in_flight:
+            collect(POLL_INTERVAL)
+            if clock() - last_poll >= POLL_INTERVAL:
+                poll(position)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # The second entry of a swap shares the outcome of the first
+    for second, first in partners.items():
+        if results[first] is not None:
+            results[second] = results[first]._replace(
+                index=second, source=plan[second][0], target=plan[second][1],
+                message=f"Swapped with item {first + 1}"
+                if results[first].status == STATUS_RENAMED else results[first].message)
+
+    if stopped_at is not None:
+        save(ResumePoint(stopped_at, retry_queue.items(), problems))
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = RenameResult(index, *plan[index], STATUS_NOT_STARTED,
+                                              attempts[index], "Run was stopped")
+    elif progress is not None:
+        progress(total, total)
+
+    return results
+
+
+def count_results(results):
+    """Return a {status: count} summary of apply_plan results."""
+    counts = {STATUS_RENAMED: 0, STATUS_SKIPPED: 0, STATUS_FAILED: 0, STATUS_NOT_STARTED: 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
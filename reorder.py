@@ -0,0 +1,56 @@
+"""
+Block reordering for the Batch File Renamer app.
+Moves a set of rows to a new position with a single list splice that only
+touches the range between the moved rows and their destination.
+"""
+
+
+def block_range(length, rows, target):
+    """Return the (start, stop) range move_block may change in a list of this length."""
+    rows = sorted(set(rows))
+    if not rows:
+        return 0, 0
+    count = len(rows)
+    target = max(0, min(target, length - count))
+    return min(rows[0], target), max(rows[-1] + 1, target + count)
+
+
+def move_block(items, rows, target):
+    """Move the items at the given rows so they start at position target.
+
+    rows may be unsorted and non-contiguous; the moved items keep their relative
+    order and end up contiguous. target is the index of the first moved item in
+    the resulting list and is clamped to the valid range. Lists passed in
+    parallel can be moved the same way by calling this once per list.
+
+    Returns (start, stop): the half-open range of positions whose contents
+    changed, or (0, 0) if nothing moved.
+    """
+    rows = sorted(set(rows))
+    if not rows:
+        return 0, 0
+
+    count = len(rows)
+    target = max(0, min(target, len(items) - count))
+
+    # Everything outside [start, stop) keeps its position
+    start = min(rows[0], target)
+    stop = max(rows[-1] + 1, target + count)
+
+    window = items[start:stop]
+    moving = set(row - start for row in rows)
+    block = [window[i] for i in sorted(moving)]
+    rest = [item for i, item in enumerate(window) if i not in moving]
+
+    offset = target - start
+    new_window = rest[:offset] + block + rest[offset:]
+    if new_window == window:
+        return 0, 0
+
+    items[start:stop] = new_window
+    return start, stop
+
+
+def drop_target(rows, drop_row):
+    """Convert 'insert before drop_row' into the target position used by move_block."""
+    return drop_row - sum(1 for row in set(rows) if row < drop_row)
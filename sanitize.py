@@ -0,0 +1,105 @@
+"""
+Filename sanitization for the Batch File Renamer app.
+Cleans a whole batch of generated names in one pass: replaces characters the
+target filesystem rejects, normalizes Unicode and truncates over-long names
+while keeping the extension.
+"""
+
+import unicodedata
+
+from dry_run import (WINDOWS_INVALID_CHARS, POSIX_INVALID_CHARS,
+                     WINDOWS_RESERVED_NAMES, MAX_NAME_BYTES)
+
+
+NORMALIZATION_FORMS = ("NFC", "NFD", "NFKC", "NFKD")
+
+
+class NameSanitizer:
+    """Sanitize file names according to a configurable policy.
+
+    replacement   - text substituted for each invalid character ('' drops them);
+                    when portable, trailing dots and spaces are removed from it
+    normalization - Unicode normalization form, or None to leave names as they are
+    portable      - apply Windows rules (reserved characters, device names,
+                    trailing dots/spaces) in addition to the POSIX ones
+    max_bytes     - maximum UTF-8 length of a name, extension included
+    """
+
+    def __init__(self, replacement="_", normalization="NFC", portable=True,
+                 max_bytes=MAX_NAME_BYTES):
+        if normalization is not None and normalization not in NORMALIZATION_FORMS:
+            raise ValueError(f"Unknown normalization form: {normalization}")
+
+        self.replacement = replacement
+        self.normalization = normalization
+        self.portable = portable
+        self.max_bytes = max_bytes
+
+        invalid_chars = WINDOWS_INVALID_CHARS if portable else POSIX_INVALID_CHARS
+        # The replacement itself must not reintroduce invalid characters
+        self.replacement = "".join(ch for ch in replacement if ch not in invalid_chars)
+        if portable:
+            # Nor end a name in a dot or space, which Windows strips
+            self.replacement = self.replacement.rstrip(' .')
+        self._invalid_chars = frozenset(invalid_chars)
+        self._table = str.maketrans({ch: self.replacement for ch in invalid_chars})
+
+    def sanitize(self, name):
+        """Return a safe version of a single file name."""
+        if self.normalization and not unicodedata.is_normalized(self.normalization, name):
+            name = unicodedata.normalize(self.normalization, name)
+
+        if not self._invalid_chars.isdisjoint(name):
+            name = name.translate(self._table)
+
+        if self.portable:
+            name = self._fix_windows_name(name)
+
+        # A UTF-8 character is at most 4 bytes, so short names never need encoding
+        if len(name) * 4 > self.max_bytes:
+            name = self._truncate(name)
+
+        if not name or name in ('.', '..'):
+            # Not the replacement, which could itself be made of dots
+            name = "_"
+        return name
+
+    def sanitize_all(self, names):
+        """Sanitize a whole batch of names, returning a new list."""
+        sanitize = self.sanitize
+        return [sanitize(name) for name in names]
+
+    def _split_extension(self, name):
+        dot = name.rfind('.')
+        if dot <= 0:
+            return name, ""
+        return name[:dot], name[dot:]
+
+    def _fix_windows_name(self, name):
+        if name[-1:] in (' ', '.'):
+            name = name.rstrip(' .')
+        first, dot, rest = name.partition('.')
+        if first.upper() in WINDOWS_RESERVED_NAMES:
+            # Windows reserves the name whatever follows the first dot, so mark
+            # the reserved part itself: CON.tar.gz -> CON_.tar.gz. Always '_',
+            # as a replacement such as ' ' would leave the name reserved.
+            name = first + "_" + dot + rest
+        return name
+
+    def _truncate(self, name):
+        encoded = name.encode('utf-8', errors='surrogatepass')
+        if len(encoded) <= self.max_bytes:
+            return name
+
+        stem, extension = self._split_extension(name)
+        ext_bytes = extension.encode('utf-8', errors='surrogatepass')
+        if len(ext_bytes) >= self.max_bytes:
+            # Pathological extension: keep as much of the whole name as fits
+            stem, ext_bytes = name, b""
+
+        budget = self.max_bytes - len(ext_bytes)
+        # Cutting on a byte boundary may split a character; 'ignore' drops the partial tail
+        stem = stem.encode('utf-8', errors='surrogatepass')[:budget].decode('utf-8', errors='ignore')
+        if self.portable:
+            stem = stem.rstrip(' .')
+        return stem + ext_bytes.decode('utf-8', errors='surrogatepass')
@@ -0,0 +1,110 @@
+"""
+Grouped sequence numbering for the Batch File Renamer app.
+Restarts the sequence number per folder, per extension or per modification
+date. All counters are computed in a single pass over the selection, and a
+reorder only renumbers the rows it touched.
+"""
+
+import os
+from datetime import datetime
+
+from reorder import move_block
+
+
+GROUP_NONE = "Whole selection"
+GROUP_FOLDER = "Per folder"
+GROUP_EXTENSION = "Per extension"
+GROUP_DATE = "Per modified date"
+GROUP_MODES = (GROUP_NONE, GROUP_FOLDER, GROUP_EXTENSION, GROUP_DATE)
+
+
+def group_keys(paths, mode, stat_cache=None):
+    """Return the numbering group of every path, in order.
+
+    GROUP_DATE reads modification times through stat_cache (a StatCache).
+    """
+    if mode == GROUP_NONE:
+        return [""] * len(paths)
+    if mode == GROUP_FOLDER:
+        dirname = os.path.dirname
+        return [dirname(os.fspath(path)) for path in paths]
+    if mode == GROUP_EXTENSION:
+        splitext = os.path.splitext
+        return [splitext(os.fspath(path))[1].lower() for path in paths]
+    if mode == GROUP_DATE:
+        stats = stat_cache.stat_all([os.fspath(path) for path in paths])
+        # Many files share a timestamp second; format each one only once
+        dates = {}
+        keys = []
+        for stat in stats:
+            if stat is None:
+                keys.append("unknown date")
+                continue
+            second = int(stat.st_mtime)
+            key = dates.get(second)
+            if key is None:
+                key = datetime.fromtimestamp(second).strftime("%Y-%m-%d")
+                dates[second] = key
+            keys.append(key)
+        return keys
+    raise ValueError(f"Unknown numbering group: {mode}")
+
+
+class GroupedSequence:
+    """Sequence numbers that restart in every group.
+
+    keys holds the group of each row; positions holds each row's 0-based
+    position inside its group and sizes the number of rows per group, all
+    filled in one pass over keys.
+    """
+
+    def __init__(self, keys, mode=GROUP_NONE):
+        self.mode = mode
+        self.keys = list(keys)
+        self.positions = []
+        sizes = {}
+        append = self.positions.append
+        for key in self.keys:
+            position = sizes.get(key, 0)
+            append(position)
+            sizes[key] = position + 1
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.keys)
+
+    def number(self, row, start_number=1):
+        """Return the sequence number of a row."""
+        return start_number + self.positions[row]
+
+    def format(self, row, start_number=1, pad=False):
+        """Return the number of a row as text, zero-padded to its group's widest number."""
+        number = start_number + self.positions[row]
+        if not pad:
+            return str(number)
+        width = len(str(start_number + self.sizes[self.keys[row]] - 1))
+        return str(number).zfill(width)
+
+    def move(self, rows, target):
+        """Apply a move_block reorder and renumber only the changed range.
+
+        Rows outside the returned (start, stop) range keep their numbers: the
+        rows before them are the same set as before. Inside the range every
+        group keeps the same run of positions, just handed out in the new order.
+        """
+        start, stop = move_block(self.keys, rows, target)
+        if start == stop:
+            return start, stop
+        move_block(self.positions, rows, target)
+
+        first = {}
+        for row in range(start, stop):
+            key = self.keys[row]
+            position = self.positions[row]
+            if position < first.get(key, position + 1):
+                first[key] = position
+        for row in range(start, stop):
+            key = self.keys[row]
+            self.positions[row] = first[key]
+            first[key] += 1
+        return start, stop
@@ -0,0 +1,240 @@
+"""
+Copy and move transfers for the Batch File Renamer app.
+Writes renamed files into a destination folder instead of renaming in place,
+using the cheapest mechanism the platform offers: a rename when source and
+destination share a device, otherwise a reflink clone, copy_file_range or
+sendfile, with a plain buffered copy as the last resort.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import sys
+import threading
+
+from atomic_rename import rename_noreplace
+
+
+MODE_RENAME = "Rename in place"
+MODE_COPY = "Copy to folder"
+MODE_MOVE = "Move to folder"
+TRANSFER_MODES = (MODE_RENAME, MODE_COPY, MODE_MOVE)
+
+# Linux ioctl that makes the destination share the source's extents (btrfs, XFS)
+FICLONE = 0x40049409
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Parallel transfers; copies are I/O bound, so a few threads keep the disks busy
+TRANSFER_WORKERS = 4
+
+# errno values meaning "this kernel shortcut is not available here, try the next one"
+_UNSUPPORTED_ERRNOS = {
+    getattr(errno, name) for name in (
+        "EXDEV", "ENOSYS", "EINVAL", "EOPNOTSUPP", "ENOTSUP", "ENOTTY", "EBADF", "EPERM",
+    ) if hasattr(errno, name)
+}
+
+
+class TransferFileSystem:
+    """Filesystem backend whose rename() copies or moves into another folder.
+
+    It is thread-safe, so apply_plan can run several transfers in parallel, and
+    counts the bytes written so the progress display can show throughput.
+    rename() refuses to overwrite an existing target by itself. With a
+    scheduler (an IOScheduler) the bytes copied are paced by its byte rate.
+    completed() lets a resumed run recognise transfers finished after the
+    last checkpoint.
+    """
+
+    no_clobber = True
+
+    def __init__(self, mode=MODE_COPY, scheduler=None):
+        if mode not in (MODE_COPY, MODE_MOVE):
+            raise ValueError(f"Unsupported transfer mode: {mode}")
+        self.mode = mode
+        self.scheduler = scheduler
+        self.bytes_done = 0
+        self._lock = threading.Lock()
+        self._devices = {}
+
+    def exists(self, path):
+        """Return True if a file or folder with this path exists."""
+        return os.path.lexists(path)
+
+    def rename(self, source, target):
+        """Copy or move source to target, never overwriting an existing target."""
+        if self.mode == MODE_MOVE and self._same_device(source, target):
+            # Fast path: a metadata-only rename, no data is copied
+            rename_noreplace(source, target)
+            return
+
+        copy_file(source, target, self._add_bytes)
+        if self.mode == MODE_MOVE:
+            try:
+                os.unlink(source)
+            except OSError:
+                # Leave exactly one complete copy behind
+                os.unlink(target)
+                raise
+
+    def completed(self, source, target):
+        """Return True if target already holds the finished transfer of source.
+
+        Copies only get their final name once complete, with the source's size
+        and modification time; a finished move has also removed the source.
+        """
+        try:
+            target_stat = os.stat(target)
+        except OSError:
+            return False
+        try:
+            source_stat = os.stat(source)
+        except FileNotFoundError:
+            return self.mode == MODE_MOVE
+        except OSError:
+            return False
+        if self.mode == MODE_MOVE:
+            return False
+        # FAT stores modification times in 2-second steps
+        return (source_stat.st_size == target_stat.st_size
+                and abs(source_stat.st_mtime - target_stat.st_mtime) < 2)
+
+    def _add_bytes(self, count):
+        with self._lock:
+            self.bytes_done += count
+        if self.scheduler is not None:
+            self.scheduler.transfer(count)
+
+    def _device(self, path):
+        if self.scheduler is not None:
+            # Shares the scheduler's per-folder cache, and its stats are paced
+            return self.scheduler.device(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        device = self._devices.get(directory)
+        if device is None:
+            device = os.stat(directory).st_dev
+            self._devices[directory] = device
+        return device
+
+    def _same_device(self, source, target):
+        return self._device(source) == self._device(target)
+
+
+def partial_name(target):
+    """Return the temporary name a copy to target is written under until complete."""
+    directory, name = os.path.split(os.fspath(target))
+    if len(os.fsencode(name)) > 200:
+        # Keep the temporary name within the 255-byte name limit
+        name = hashlib.sha1(os.fsencode(name)).hexdigest()
+    return os.path.join(directory, f".{name}.part")
+
+
+def copy_file(source, target, on_bytes=None):
+    """Copy source to a new file target and return the number of bytes copied.
+
+    The data is written to partial_name(target) and renamed to target once
+    complete, so an interrupted copy never leaves a truncated target behind.
+    Fails with FileExistsError instead of overwriting. on_bytes(count) is
+    called as data is written. On any failure the temporary file is removed.
+    """
+    if os.path.lexists(target):
+        # The final rename refuses too, but checking first saves copying the data
+        raise FileExistsError(errno.EEXIST, "File exists", os.fspath(target))
+    partial = partial_name(target)
+    with open(source, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        try:
+            dst_fd = os.open(partial, flags, 0o666)
+        except FileExistsError:
+            # Left behind by a copy that was interrupted
+            os.unlink(partial)
+            dst_fd = os.open(partial, flags, 0o666)
+        try:
+            with open(dst_fd, 'wb', closefd=True) as dst:
+                _copy_data(src, dst, size, on_bytes or (lambda count: None))
+            shutil.copystat(source, partial)
+            rename_noreplace(partial, target)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+    return size
+
+
+def _copy_data(src, dst, size, on_bytes):
+    """Copy an open file using the fastest available mechanism."""
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+
+    if size and sys.platform.startswith('linux'):
+        if _try_reflink(src_fd, dst_fd):
+            on_bytes(size)
+            return
+
+    for kernel_copy in (_copy_file_range, _sendfile):
+        copied = kernel_copy(src_fd, dst_fd, size, on_bytes)
+        if copied is not None:
+            if copied >= size:
+                return
+            # The kernel copy stopped early; finish from where it got to
+            src.seek(copied)
+            dst.seek(copied)
+            break
+
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        dst.write(chunk)
+        on_bytes(len(chunk))
+
+
+def _try_reflink(src_fd, dst_fd):
+    """Clone the file's extents (copy-on-write); return True on success."""
+    try:
+        import fcntl
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def _copy_file_range(src_fd, dst_fd, size, on_bytes):
+    """Copy in the kernel with copy_file_range; return bytes copied or None if unsupported."""
+    if not hasattr(os, 'copy_file_range'):
+        return None
+    return _kernel_copy_loop(
+        lambda offset: os.copy_file_range(src_fd, dst_fd, min(CHUNK_SIZE, size - offset)),
+        size, on_bytes)
+
+
+def _sendfile(src_fd, dst_fd, size, on_bytes):
+    """Copy in the kernel with sendfile; return bytes copied or None if unsupported."""
+    if not hasattr(os, 'sendfile') or not sys.platform.startswith('linux'):
+        return None
+    return _kernel_copy_loop(
+        lambda offset: os.sendfile(dst_fd, src_fd, offset, min(CHUNK_SIZE, size - offset)),
+        size, on_bytes)
+
+
+def _kernel_copy_loop(copy_chunk, size, on_bytes):
+    copied = 0
+    while copied < size:
+        try:
+            sent = copy_chunk(copied)
+        except OSError as e:
+            if copied == 0 and e.errno in _UNSUPPORTED_ERRNOS:
+                return None
+            raise
+        if sent == 0:
+            # Source shrank or reached EOF early
+            break
+        copied += sent
+        on_bytes(sent)
+    return copied
+